@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Aug 15 10:02:50 2020
+
+@author: esnil
+
+Solve the QPLIB instances of qplib/ as QPs and through their
+linearizations. The package is split by what each part needs, so that
+importing one (a worker process, a short command of qplib-run) does not
+pay for the others: gurobipy is imported by the gurobi backend only,
+scipy.optimize by the HiGHS backend and the LP bound tightening, and
+pandas by the analysis modules (and the read functions of the store).
+
+    - instances     : readaQP, QPLIBProblem and the cache of parsed instances
+    - model         : QPModel, the solver-independent model of a formulation
+    - presolve      : presolve_QBL, split_QBL
+    - heuristics    : tabu_search, solve_tabu
+    - backends      : the solvers of a QPModel, "gurobi" and "highs"
+    - formulations  : build_QP, build_Glover_Woolsey, build_Glover, build_RLT,
+                      build_QCR and their solve functions, solve_formulation,
+                      solve_decomposed
+    - runner        : jobs_for, run_job, run_batch
+    - racing        : run_race
+    - scheduling    : predict_times, run_campaign
+    - verification  : evaluate_solutions, verify_solution
+    - store         : the results store, open_results, add_result, read_results
+    - benchmarks    : run_benchmark, benchmark_times, performance_profile,
+                      benchmark_table
+    - cli           : main, the command line qplib-run (python -m qplib)
+
+The main functions:
+    
+    - readaQP                      : read datos
+    - solve_QP_gurobi              : solve QP problem
+    - solve_Glover_Woolsey_gurobi  : solve QP linealized with G-W method
+    - solve_Glover_gurobi          : solve QP linealized with G method
+    - solve_RLT_gurobi             : solve QP linealized with first-level RLT
+    - solve_QCR_gurobi             : solve QP convexified (QCR) as a convex MIQP
+    - solve_formulation            : solve QP with a formulation of formulations
+    - run_benchmark                : solve the runs of a benchmark, for benchmark_table
+                                     and performance_profile
+    - run_campaign                 : solve jobs within a wall-clock time, budgeting
+                                     their time limits by predicted difficulty
+    - run_batch                    : solve many (instance, method) jobs in parallel
+    - run_race                     : solve one instance with several methods at once,
+                                     sharing incumbents, until one proves optimality
+    - presolve_QBL                 : reduce a binary problem before linearizing it
+    - solve_decomposed             : solve the independent blocks of a binary problem
+                                     apart, in parallel, as one result
+    - solve_tabu                   : tabu search heuristic for binary problems
+    - verify_solution              : check a solution and its objective outside the solver
+
+readaQP returns a QPLIBProblem with every section of the file. Unpacking
+it gives the inputs of the solve functions (name, typee and sense wrapped
+in lists, as in name[0] and sense[0][0]):
+
+    name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu = readaQP('QPLIB_0067')
+
+and problem.linearizable() tells whether the linearizations apply.
+
+The inputs of the functions solve_Glover_Woolsey_gurobi and solve_Glover_gurobi
+    
+    - name   : problem's name
+    - typee  : Quadratic Binaray var and linear constraints (QBL)
+    - sense  : Maximize or Minimize
+    - n      : number of variables binary
+    - m      : number of constraints linear
+    - Q0     : sparse matrix (CSR) orden n x n, lower triangle
+    - b0     : array orden n x 1
+    - q0     : constant
+    - A0     : sparse matrix (CSR) orden m x n
+    - ccl    : array orden m x 1
+    - ccu    : array orden m x 1
+
+QP: 1/2 x^t Q0 x + b0^t x + q0
+
+s.t. 
+
+    ccl <= A0 x <= ccu 
+    
+    x is {0,1}
+    
+solve_QP_gurobi also takes the keywords l, u, vtype and Qc of a
+QPLIBProblem, for the general problem with bounds l <= x <= u, continuous
+('C'), integer ('I') or binary ('B') variables and the quadratic rows
+
+    ccl_i <= 1/2 x^t Qc_i x + A0_i x <= ccu_i
+
+Each solve function builds its formulation once as a QPModel (build_QP,
+build_Glover_Woolsey, build_Glover) and hands it to a backend, chosen with
+the keyword backend (and its time limit with timelimit):
+
+    - "gurobi" : Gurobi, every formulation (default)
+    - "highs"  : HiGHS through scipy.optimize.milp, the linear formulations only
+
+The outputs of the functions solve_QP_gurobi, solve_Glover_Woolsey_gurobi and solve_Glover_gurobi
+
+it's a dictionary, with the keys:
+    - name      : problem's name
+    - timeload  : time it takes to build the model
+    - timerun   : time to solve el model
+    - gapmip    : gap of solution
+    - solobj    : the best integer solution found
+    - solBound  : the best upper bound solution found
+    - status    : if it is optimal (2), in Gurobi codes for every backend
+    - solrelax  : bound provided by the relaxation, with the keyword relax
+                  of the linearizations: "root" (default) the root node
+                  relaxation of the MIP, "lp" the Linear Programming
+                  relaxation solved apart, False none (nan)
+                  (nan for solve_QP_gurobi)
+    - x         : the best solution found, None without one
+
+and the telemetry of the solve:
+    - timeparse    : time to read the instance (run_job only, nan otherwise)
+    - timepresolve : time of the presolve and the MIP start
+    - timebuild    : time to build the formulation
+    - numvars, numrows, numnz : size of the formulation
+    - trajectory   : (time, incumbent, bound) samples of the solve, from a
+                     Gurobi callback (the final point only with HiGHS)
+
+Every solve function takes a start x with the keyword start (a MIP start;
+the linearizations derive y and w from it).
+
+solve_Glover_Woolsey_gurobi(..., compact=True) keeps only the McCormick
+inequalities the sign of each product needs, with 0 <= y <= 1 as bounds.
+With lazy=True the McCormick inequalities are lazy rows of the QPModel:
+the model starts with the objective and the constraints, and the backend
+adds the rows a solution violates (Gurobi lazy-constraint callbacks, HiGHS
+rounds of solves). triangles=True adds the triangle inequalities of every
+triple of products, always as lazy rows.
+
+The binary formulations are registered by name in formulations ("GW",
+"G", "RLT", "QCR", each a build function) and solved the same way by
+solve_formulation(formulation, name,...,ccu, ...), with the same result.
+"""
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+python -m qplib, the same as qplib-run
+"""
+
+import sys
+
+from qplib.cli import main
+
+
+sys.exit(main())
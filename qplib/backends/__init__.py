@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+The solver backends of a QPModel
+"""
+
+import numpy as np
+
+
+######################
+#
+#  Backends
+#
+# A backend is a module of this package with
+#
+#     solve(model, timelimit, lpfile=None, relax=False, threads=None, seed=None)
+#
+# that turns a QPModel into a solver model, solves it and returns the
+# result dictionary. backends names them; a backend module is imported the
+# first time a model is solved with it, and with it its solver (gurobipy,
+# scipy.optimize).
+
+backends = {"gurobi": "qplib.backends.gurobi", "highs": "qplib.backends.highs"}
+
+
+def _has_gurobi():
+    # gurobipy is installed, without importing it
+    import importlib.util
+    return importlib.util.find_spec('gurobipy') is not None
+
+
+def solve_model(model, backend, timelimit, lpfile, relax, buildtime, threads, presolvetime=0.0, seed=None):
+    import importlib
+    
+    # the result of the backend, with the time before the solve in timeload
+    # and the telemetry of the phases and of the model size
+    solve = importlib.import_module(backends[backend]).solve
+    result = solve(model, timelimit, lpfile=lpfile, relax=relax, threads=threads, seed=seed)
+    result["timeload"] = result["timeload"] + presolvetime + buildtime
+    result["timeparse"] = np.nan
+    result["timepresolve"] = presolvetime
+    result["timebuild"] = buildtime
+    result["numvars"], result["numrows"], result["numnz"] = model.size()
+    
+    return result
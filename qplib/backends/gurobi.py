@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+The Gurobi backend: every formulation, through gurobipy
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import gurobipy as gp
+from gurobipy import GRB
+
+from qplib import racing
+from qplib.model import _violated
+from qplib.presolve import _unfix
+
+
+def _quad_expr(x, L):
+    
+    # 1/2 x^t L x over the entries of the lower triangle L as listed in the
+    # file, the reading under which the solution values in instancedata.csv
+    # are obtained. In matrix form (an MQuadExpr, gurobipy 10 and later),
+    # or one QuadExpr filled in bulk: no Python term per entry
+    L = sp.csr_matrix(L)
+    if _matrix_api():
+        xm = gp.MVar.fromlist(list(x[:L.shape[0]]))
+        return xm @ (0.5*L) @ xm
+    
+    L = L.tocoo()
+    expr = gp.QuadExpr()
+    expr.addTerms((0.5*L.data).tolist(), [x[r] for r in L.row], [x[c] for c in L.col])
+    return expr
+
+
+def _matrix_api():
+    # gurobipy builds matrix expressions over a list of variables
+    return hasattr(getattr(gp, 'MVar', None), 'fromlist')
+
+
+def _add_quad_constr(g, constr):
+    
+    # a quadratic row over _quad_expr; the matrix ones go through addConstr
+    if _matrix_api():
+        return g.addConstr(constr)
+    return g.addQConstr(constr)
+
+
+def _add_linear_rows(model, x, A0, ccl, ccu):
+    
+    # ccl <= A0 x <= ccu as one row per constraint, in a single addMConstr
+    # over the nonzeros of A0: an equality when ccl == ccu, one inequality
+    # when a side is infinite, and A0_i x - s_i = 0 with ccl_i <= s_i <= ccu_i
+    # (the range row Gurobi itself builds) when both sides are finite.
+    # Rows without a finite side are dropped. x is an MVar or a list of Var.
+    # Returns the rows and the range variables s.
+    
+    A0 = sp.csr_matrix(A0)
+    upper = np.isfinite(ccu)
+    lower = np.isfinite(ccl)
+    
+    equal = upper & lower & (ccl == ccu)
+    ranged = upper & lower & (ccl != ccu)
+    rows = np.flatnonzero(upper | lower)
+    
+    sense = np.where(equal | ranged, GRB.EQUAL, np.where(upper, GRB.LESS_EQUAL, GRB.GREATER_EQUAL))[rows]
+    rhs = np.where(ranged, 0.0, np.where(upper, ccu, ccl))[rows]
+    
+    s = model.addMVar(int(ranged.sum()), lb=ccl[ranged], ub=ccu[ranged], name="s")
+    
+    # -1 on the range variable of each ranged row
+    k = len(rows)
+    S = sp.csr_matrix((-np.ones(s.shape[0]), (np.flatnonzero(ranged[rows]), np.arange(s.shape[0]))), shape=(k, s.shape[0]))
+    
+    if hasattr(x, 'tolist'):
+        x = x.tolist()
+    
+    constrs = model.addMConstr(sp.hstack([A0[rows], S]).tocsr(), list(x) + s.tolist(), sense, rhs)
+    
+    return constrs, s
+
+
+def _separate(g, z, rows, add):
+    
+    # add(expr sense rhs) for the side of every row of g._lazy violated at z
+    A, rl, ru = g._lazy
+    act = A[rows] @ z
+    for row, value in zip(rows, act):
+        Ai = A[row]
+        expr = gp.LinExpr(Ai.data.tolist(), [g._z[j] for j in Ai.indices])
+        if value > ru[row]:
+            add(expr <= ru[row])
+        else:
+            add(expr >= rl[row])
+
+
+def _mip_callback(g, where):
+    
+    # the trajectory of the MIP, a (time, incumbent, bound) sample whenever
+    # the incumbent changes or the bound moves by more than 1e-4 (relative)
+    if where == GRB.Callback.MIP:
+        sample = (g.cbGet(GRB.Callback.MIP_OBJBST), g.cbGet(GRB.Callback.MIP_OBJBND))
+        if g._sample is None or sample[0] != g._sample[0] or abs(sample[1] - g._sample[1]) > 1e-4*(1.0 + abs(g._sample[1])):
+            g._sample = sample
+            incumbent = sample[0] if abs(sample[0]) < GRB.INFINITY else np.nan
+            g._trajectory.append((g.cbGet(GRB.Callback.RUNTIME), incumbent, sample[1]))
+    
+    # the lazy rows violated by a new incumbent or by the relaxation of a
+    # node (the most violated, not added yet at a node)
+    if g._lazy is not None and where == GRB.Callback.MIPSOL:
+        z = np.array(g.cbGetSolution(g._z))
+        rows = _violated(*g._lazy, z)
+        _separate(g, z, rows, g.cbLazy)
+        if len(rows) > 0:
+            return
+    if g._lazy is not None and where == GRB.Callback.MIPNODE and g.cbGet(GRB.Callback.MIPNODE_STATUS) == GRB.OPTIMAL:
+        z = np.array(g.cbGetNodeRel(g._z))
+        rows = _violated(*g._lazy, z, most=None)
+        rows = rows[~g._added[rows]][:200]
+        g._added[rows] = True
+        _separate(g, z, rows, g.cbLazy)
+    
+    # with relax "root", the objective of the first relaxation solved at
+    # the root node, before any cut; Gurobi's presolve may make it tighter
+    # than the LP relaxation
+    if where == GRB.Callback.MIPNODE and g._relax == "root" and g._lazy is None and np.isnan(g._root):
+        if g.cbGet(GRB.Callback.MIPNODE_NODCNT) == 0 and g.cbGet(GRB.Callback.MIPNODE_STATUS) == GRB.OPTIMAL:
+            z = np.array(g.cbGetNodeRel(g._z))
+            root = np.dot(g._c, z) + g._constant
+            if g._Q is not None:
+                Q = g._Q.tocoo()
+                root += 0.5*np.sum(Q.data*z[Q.row]*z[Q.col])
+            g._root = float(root)
+    
+    # in a race (run_race), the incumbent shared with the other racers
+    if g._fixed is not None:
+        _race_callback(g, where)
+
+
+def _race_callback(g, where):
+    
+    # the incumbent shared with the other racers, as sign*objective, and
+    # its x on the variables of the problem
+    incumbent, shared, done = racing._race
+    
+    if where == GRB.Callback.MIP:
+        bound = g._sign*g.cbGet(GRB.Callback.MIP_OBJBND)
+        if done.is_set() or (np.isfinite(incumbent.value) and incumbent.value - bound <= 1e-4*abs(incumbent.value)):
+            done.set()
+            g.terminate()
+    
+    elif where == GRB.Callback.MIPSOL:
+        obj = g._sign*g.cbGet(GRB.Callback.MIPSOL_OBJ)
+        with incumbent.get_lock():
+            if obj < incumbent.value:
+                incumbent.value = g._published = obj
+                shared[:] = _unfix(np.array(g.cbGetSolution(g._z[:g._numx])), g._fixed)
+    
+    elif where == GRB.Callback.MIPNODE:
+        with incumbent.get_lock():
+            obj, x = incumbent.value, np.array(shared[:])
+        if obj < g._published and obj < g._sign*g.cbGet(GRB.Callback.MIPNODE_OBJBST):
+            g._published = obj
+            g.cbSetSolution(g._z[:g._numx], x[g._free].tolist())
+            g.cbUseSolution()
+
+
+def solve(model, timelimit, lpfile=None, relax=False, threads=None, seed=None):
+    import time
+
+    end_time = runtime = gap = solobj = solBound = status = solrelax = np.nan
+    x = None
+    trajectory = []
+
+    try:
+        
+        start_time = time.time()
+        # Create a new model
+        g = gp.Model(model.name)
+        
+        # Create variables, one MVar per block
+        z = []
+        for blockname, first, size in model.blocks:
+            block = slice(first, first + size)
+            z += g.addMVar(size, lb=model.lb[block], ub=model.ub[block], vtype=list(model.vtype[block]), name=blockname).tolist()
+        
+        g.update()
+        
+        # MIP start
+        for j in np.flatnonzero(~np.isnan(model.start)):
+            z[j].Start = model.start[j]
+        
+        if 'minimize' == model.sense:
+            g.modelSense = GRB.MINIMIZE
+        else:
+            g.modelSense = GRB.MAXIMIZE
+        g.update()
+        
+        # constraints
+        A, rl, ru = model.matrix()
+        _add_linear_rows(g, z, A, rl, ru)
+        g.update()
+        
+        for i in model.qrows:
+            Qi, Ai, rli, rui = model.qrows[i]
+            expr = _quad_expr(z, Qi) + gp.LinExpr(list(Ai.data), [z[j] for j in Ai.indices])
+            if rli == rui:
+                _add_quad_constr(g, expr == rui)
+                continue
+            if np.isfinite(rui):
+                _add_quad_constr(g, expr <= rui)
+            if np.isfinite(rli):
+                _add_quad_constr(g, expr >= rli)
+        g.update()
+        
+        # function objetive
+        nz = np.flatnonzero(model.c)
+        objective = gp.LinExpr(list(model.c[nz]), [z[j] for j in nz]) + model.constant
+        if model.Q is not None:
+            objective = objective + _quad_expr(z, model.Q)
+        g.setObjective(objective)
+        
+        g.params.TimeLimit = timelimit
+        if threads is not None:
+            g.params.Threads = threads
+        if seed is not None:
+            g.params.Seed = seed
+        g._lazy = None
+        if model.lazy:
+            g._lazy = model.matrix(lazy=True)
+            g._added = np.zeros(g._lazy[0].shape[0], dtype=bool)
+            g.params.LazyConstraints = 1
+        if model.nonconvex and 'NonConvex' in dir(GRB.Param):
+            g.params.NonConvex = 2
+        g.update()
+        
+        end_time = time.time() - start_time
+        
+        # Optimize. A MIP is followed in a callback, for its trajectory and
+        # (relax "root") its root relaxation
+        g._z, g._c, g._Q, g._constant, g._root = z, model.c, model.Q, model.constant, np.nan
+        g._relax, g._trajectory, g._sample = relax, [], None
+        g._fixed = None
+        fixed = np.full(model.numx, np.nan) if model.fixed is None else model.fixed
+        if racing._race is not None and len(fixed) == len(racing._race[1]) and np.sum(np.isnan(fixed)) == model.numx:
+            g._fixed, g._free, g._numx, g._published = fixed, np.isnan(fixed), model.numx, np.inf
+            g._sign = 1.0 if 'minimize' == model.sense else -1.0
+        if g.IsMIP:
+            g.optimize(_mip_callback)
+        else:
+            g.optimize()
+        
+        runtime  = g.Runtime
+        status   = g.status
+        trajectory = g._trajectory
+        if g.SolCount > 0:
+            trajectory.append((runtime, g.objVal, g.ObjBound if g.IsMIP else g.objVal))
+        if g.SolCount > 0:
+            x    = np.array(g.getAttr('X', z[:model.numx]))
+        solobj   = g.objVal
+        if g.IsMIP:
+            gap      = g.MIPGap
+            solBound = g.ObjBound
+        else:
+            gap      = 0.0
+            solBound = g.objVal
+        
+        # solve relax model, when asked for or when the MIP was solved
+        # before a root relaxation (in presolve); with lazy rows, the LP
+        # relaxation adds them in rounds until none is violated
+        solrelax = g._root
+        if relax == "lp" or (relax == "root" and np.isnan(solrelax)):
+            r = g.relax()
+            r.optimize()
+            if g._lazy is not None:
+                rz = r.getVars()[:model.numcols]
+                while r.status == GRB.OPTIMAL:
+                    rows = _violated(*g._lazy, np.array(r.getAttr('X', rz)))
+                    if len(rows) == 0:
+                        break
+                    A, rl, ru = g._lazy
+                    _add_linear_rows(r, rz, A[rows], rl[rows], ru[rows])
+                    r.optimize()
+            solrelax = r.objval
+        
+        # print model in format .lp
+        if lpfile is not None:
+            g.write(lpfile)
+    
+    except gp.GurobiError as e:
+        print('Error code ' + str(e.errno) + ": " + str(e))
+
+    except AttributeError:
+        print('Encountered an attribute error')
+    
+    return {"name": model.name,"timeload": end_time,"timerun": runtime,"gapmip": gap,"solobj": solobj,"solBound": solBound,"status": status,"solrelax": solrelax,"x": x,"trajectory": trajectory}
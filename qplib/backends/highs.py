@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+The HiGHS backend: the linear formulations, through scipy.optimize.milp
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import milp, LinearConstraint, Bounds
+
+from qplib.model import _violated
+
+
+def _milp_separating(c, integrality, bounds, rows, lazy, timelimit):
+    
+    # scipy.optimize.milp over the rows and the lazy rows violated by its
+    # solutions, added in rounds until none is. The rows violated by the
+    # LP relaxation go in first, in rounds of LPs, so that the first MILP
+    # already has most of them. A MILP solution that violates some gives an
+    # incumbent all the same, the continuous columns solved again with the
+    # integer ones fixed (an LP left without a time limit, to have it at
+    # the end too); the best one is returned when the time is over (x None
+    # without any)
+    import time
+    
+    end = time.time() + timelimit
+    A, rl, ru = rows
+    L, ll, lu = lazy
+    active = np.zeros(L.shape[0], dtype=bool)
+    integer = np.asarray(integrality) != 0
+    
+    def solve(integrality, bounds, active, limited=True):
+        M = sp.vstack([A, L[active]]).tocsr()
+        constraints = [LinearConstraint(M, np.concatenate([rl, ll[active]]), np.concatenate([ru, lu[active]]))] if M.shape[0] > 0 else []
+        options = {"time_limit": max(end - time.time(), 0.0)} if limited else {}
+        return milp(c, integrality=integrality, bounds=bounds, constraints=constraints, options=options)
+    
+    if integer.any() and L.shape[0] > 0:
+        while time.time() < end:
+            r = solve(np.zeros(len(c)), bounds, active)
+            new = _violated(L, ll, lu, r.x) if r.x is not None else []
+            if len(new) == 0:
+                break
+            active[new] = True
+    
+    best = None
+    while True:
+        res = solve(integrality, bounds, active)
+        if res.x is None:
+            break
+        new = _violated(L, ll, lu, res.x)
+        if len(new) == 0:
+            return res
+        
+        # the incumbent of the round, on every lazy row
+        lb, ub = np.array(bounds.lb, dtype=float), np.array(bounds.ub, dtype=float)
+        lb[integer] = ub[integer] = np.round(res.x[integer])
+        fixed = solve(np.zeros(len(c)), Bounds(lb, ub), np.ones(L.shape[0], dtype=bool), limited=False)
+        if fixed.x is not None and fixed.status == 0 and (best is None or fixed.fun < best.fun):
+            best = fixed
+        
+        if time.time() >= end:
+            break
+        active[new] = True
+    
+    if best is not None:
+        # a time limit; the bound of the last round, with fewer rows, still
+        # bounds the full model
+        bound = getattr(res, 'mip_dual_bound', None)
+        res.x, res.fun, res.status = best.x, best.fun, 1
+        res.mip_dual_bound = bound if bound is not None and np.isfinite(bound) else -np.inf
+        res.mip_gap = abs(res.fun - res.mip_dual_bound)/max(abs(res.fun), 1e-10)
+        return res
+    res.x = None
+    return res
+
+
+# scipy.optimize.milp status -> Gurobi status
+_highs_status = {0: 2, 1: 9, 2: 3, 3: 5, 4: 12}
+
+
+def solve(model, timelimit, lpfile=None, relax=False, threads=None, seed=None):
+    import time
+
+    end_time = runtime = gap = solobj = solBound = status = solrelax = np.nan
+    x = None
+
+    # HiGHS through scipy only solves linear models; lpfile is not written,
+    # threads and seed are left to HiGHS and the MIP start unused, scipy
+    # does not pass them on, and the trajectory is the final point only
+    if model.Q is not None or model.qrows:
+        print('Error: the HiGHS backend solves linear models only')
+        return {"name": model.name,"timeload": end_time,"timerun": runtime,"gapmip": gap,"solobj": solobj,"solBound": solBound,"status": status,"solrelax": solrelax,"x": x,"trajectory": []}
+
+    start_time = time.time()
+    
+    # milp minimizes
+    if 'minimize' == model.sense:
+        sign = 1.0
+    else:
+        sign = -1.0
+    
+    A, rl, ru = model.matrix()
+    lazy = model.matrix(lazy=True)
+    bounds = Bounds(model.lb, model.ub)
+    integrality = (model.vtype != 'C').astype(int)
+    
+    end_time = time.time() - start_time
+    
+    # milp needs a variable: without any (all fixed in presolve) the rows
+    # are checked and the objective is the constant
+    if model.numcols == 0:
+        feasible = np.all(rl <= 1e-9) and np.all(ru >= -1e-9)
+        status = 2 if feasible else 3
+        if feasible:
+            runtime = gap = 0.0
+            solobj = solBound = model.constant
+            x = np.zeros(0)
+            if relax:
+                solrelax = model.constant
+        return {"name": model.name,"timeload": end_time,"timerun": runtime,"gapmip": gap,"solobj": solobj,"solBound": solBound,"status": status,"solrelax": solrelax,"x": x,"trajectory": [(runtime, solobj, solBound)] if feasible else []}
+    
+    # the relaxation first (scipy gives no root node information, so
+    # "root" is the LP relaxation as well), charged to the time limit: the
+    # MIP gets what it leaves
+    start_time = time.time()
+    if relax:
+        r = _milp_separating(sign*model.c, np.zeros(model.numcols), bounds, (A, rl, ru), lazy, timelimit)
+        if r.x is not None:
+            solrelax = sign*r.fun + model.constant
+    
+    res = _milp_separating(sign*model.c, integrality, bounds, (A, rl, ru), lazy, max(timelimit - (time.time() - start_time), 0.0))
+    runtime = time.time() - start_time
+    
+    status = _highs_status.get(res.status, 12)
+    if res.x is not None:
+        x = res.x[:model.numx]
+        solobj = sign*res.fun + model.constant
+        gap = getattr(res, 'mip_gap', None) or 0.0
+        bound = getattr(res, 'mip_dual_bound', None)
+        solBound = solobj if bound is None else sign*bound + model.constant
+    
+    trajectory = [(runtime, solobj, solBound)] if x is not None else []
+    
+    return {"name": model.name,"timeload": end_time,"timerun": runtime,"gapmip": gap,"solobj": solobj,"solBound": solBound,"status": status,"solrelax": solrelax,"x": x,"trajectory": trajectory}
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of methods and backends over instancedata.csv
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from qplib.runner import jobs_for, run_batch, unsupported
+from qplib.store import open_results, add_result, results_done, read_results, _params_key
+
+
+######################
+#
+#  Benchmarks
+#
+# A benchmark solves the instances of instancedata.csv picked by
+# select_instances with every run of benchmark_runs, a method and the
+# params (backend, threads, seed, time limit) it is solved with, and keeps
+# the results in the results store. benchmark_times compares them with
+# solobjvalue: a run solves an instance when it proves optimality at that
+# value, and its time is the time before the solve plus the solve. The
+# times give the Dolan-More performance profiles of performance_profile
+# and the shifted geometric means of benchmark_table.
+
+
+def select_instances(datos=None, probtype="QBL", nbinvars=None, ncons=None, density=None):
+    
+    # the rows of datos (instancedata.csv by default) of the instances in
+    # qplib/ of the type(s) probtype (any with None) and with nbinvars,
+    # ncons and density in the (min, max) ranges given, in increasing
+    # number of binary variables
+    if datos is None:
+        datos = pd.read_csv('instancedata.csv')
+    
+    keep = np.array([os.path.exists('qplib/' + name + '.qplib') for name in datos['name']], dtype=bool)
+    if probtype is not None:
+        keep &= datos['probtype'].isin([probtype] if isinstance(probtype, str) else list(probtype)).to_numpy()
+    for column, bounds in (("nbinvars", nbinvars), ("ncons", ncons), ("density", density)):
+        if bounds is not None:
+            keep &= datos[column].between(*bounds).to_numpy()
+    
+    return datos[keep].sort_values('nbinvars', kind='stable')
+
+
+def benchmark_runs(methods=("GW", "G"), backends=("gurobi",), threads=(1,), seeds=(0,), timelimit=600):
+    
+    # every (method, params) of a benchmark
+    return [(method, {"backend": backend, "threads": t, "seed": seed, "timelimit": timelimit})
+            for method in methods for backend in backends for t in threads for seed in seeds]
+
+
+def run_benchmark(names, runs, workers=None, results=None):
+    
+    # solve every instance of names with every run of runs not in the store
+    # results (open_results() by default) yet, without reuse of solutions
+    # between jobs, and yield (job, params, result) as they finish
+    if results is None:
+        results = open_results()
+    
+    linearizations = [method for method, params in runs if method != "QP"]
+    applicable = dict((name, set(method for _, method in jobs_for(name, linearizations))) for name in names)
+    
+    for key in sorted(set(_params_key(params) for method, params in runs)):
+        params = json.loads(key)
+        done = results_done(results, params)
+        jobs = [(name, method) for method, p in runs if _params_key(p) == key
+                for name in names if method in applicable[name] and method not in unsupported[params["backend"]]
+                and (name, method) not in done]
+        
+        for job, result in run_batch(jobs, workers=workers, threads=params["threads"], backend=params["backend"],
+                                     timelimit=params["timelimit"], reuse=False, seed=params["seed"]):
+            add_result(results, job, params, result)
+            yield job, params, result
+
+
+def _run_label(method, params):
+    
+    # the name of a run in the tables, the seed aside
+    return method + "/" + params["backend"] + "/" + str(params["threads"]) + "t"
+
+
+def benchmark_times(results, datos, runs, tol=1e-4):
+    
+    '''
+    The time of every run on every instance of datos (rows of
+    instancedata.csv) and seed: a DataFrame with one row per (name, seed),
+    one column per run (_run_label), inf where the run did not solve the
+    instance and nan where it was not run. A run solves an instance when its
+    status is optimal (2) and solobj is solobjvalue within tol (relative);
+    an optimal status at another value is reported and counted unsolved.
+    '''
+    reference = dict(zip(datos['name'], datos['solobjvalue']))
+    
+    columns = {}
+    for method, params in runs:
+        label = _run_label(method, params)
+        data = read_results(results, method, params)
+        data = data[data['name'].isin(list(reference))]
+        
+        time = (data['timeload'] + data['timerun']).to_numpy(dtype=float)
+        target = data['name'].map(reference).to_numpy(dtype=float)
+        agree = np.abs(data['solobj'].to_numpy(dtype=float) - target) <= tol*np.maximum(1.0, np.abs(target))
+        optimal = (data['status'] == 2).to_numpy()
+        for name in data['name'][optimal & ~agree]:
+            print('Warning: ' + label + ' proves ' + name + ' optimal away from solobjvalue')
+        
+        index = pd.MultiIndex.from_arrays([data['name'].to_numpy(), np.full(len(data), params["seed"])], names=['name', 'seed'])
+        columns.setdefault(label, []).append(pd.Series(np.where(optimal & agree, time, np.inf), index=index))
+    
+    return pd.DataFrame(dict((label, pd.concat(parts)) for label, parts in columns.items()))
+
+
+def performance_profile(times, taus=None):
+    
+    # the Dolan-More profile of the runs (columns) of times: for every
+    # tau, the fraction of the problems (rows, those every run was given)
+    # a run solves within tau times the time of the fastest run
+    times = times.dropna()
+    best = times.min(axis=1)
+    ratios = times.div(best.where(np.isfinite(best)), axis=0)
+    
+    if taus is None:
+        finite = ratios.to_numpy()[np.isfinite(ratios.to_numpy())]
+        taus = np.unique(np.concatenate([[1.0], finite]))
+    
+    profile = dict((label, [float((ratios[label] <= tau).mean()) if len(times) else np.nan for tau in taus]) for label in times.columns)
+    
+    return pd.DataFrame(profile, index=pd.Index(taus, name='tau'))
+
+
+def shifted_geometric_mean(values, shift=10.0):
+    
+    # exp(mean(log(v + shift))) - shift, the mean of the benchmarks: no
+    # instance weighs much more than another, nor a very short time
+    values = np.asarray(values, dtype=float)
+    
+    return float(np.exp(np.mean(np.log(values + shift))) - shift)
+
+
+def benchmark_table(times, runs, shift=10.0):
+    
+    # one row per run of times: the problems solved and the shifted
+    # geometric mean of the time, with the time limit for the unsolved
+    timelimit = dict((_run_label(method, params), params["timelimit"]) for method, params in runs)
+    times = times.dropna()
+    
+    rows = []
+    for label in times.columns:
+        solved = np.isfinite(times[label])
+        rows.append({"run": label, "problems": len(times), "solved": int(solved.sum()),
+                     "sgmtime": shifted_geometric_mean(np.minimum(times[label], timelimit[label]), shift)})
+    
+    return pd.DataFrame(rows, columns=["run", "problems", "solved", "sgmtime"])
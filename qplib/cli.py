@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+The command line, qplib-run
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+
+from qplib import runner
+from qplib.backends import backends, _has_gurobi
+from qplib.store import resultspath, open_results, add_result, results_done
+
+
+def main(argv=None):
+    
+    '''
+    The command line of qplib-run, e.g.
+    
+        qplib-run --instances QPLIB_0067 QPLIB_0633 --method GW G --jobs 4
+    
+    solves every instance (all the ones in qplib/ with "all") with every
+    method (by default the ones of jobs_for, by problem type) on jobs
+    worker processes. It prints a line per job as it finishes and keeps
+    the results in the store, skipping the jobs the store already has for
+    the same options; the jobs the backend cannot solve are reported and
+    left out. Returns the exit status, 1 when a job failed.
+    '''
+    
+    parser = argparse.ArgumentParser(prog='qplib-run', description='Solve QPLIB instances with the QP and its linearizations.')
+    parser.add_argument('--instances', nargs='+', required=True, help='instance names (QPLIB_0067 ...), or all for every instance in qplib/')
+    parser.add_argument('--method', nargs='+', choices=sorted(runner.methods), help='methods to run (default: the QP or both linearizations, by problem type)')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: one per core)')
+    parser.add_argument('--threads', type=int, default=None, help='solver threads per job')
+    parser.add_argument('--backend', choices=sorted(backends), default=None, help='solver (default: gurobi when installed, else highs)')
+    parser.add_argument('--timelimit', type=float, default=None, help='time limit per job, in seconds')
+    parser.add_argument('--seed', type=int, default=None, help="solvers' random seed")
+    parser.add_argument('--decompose', action='store_true', help='solve the independent blocks of an instance apart')
+    parser.add_argument('--results', default=resultspath, help='results store (default: %(default)s)')
+    args = parser.parse_args(argv)
+    
+    names = args.instances
+    if names == ["all"]:
+        names = sorted(f[:-len('.qplib')] for f in os.listdir('qplib') if f.endswith('.qplib'))
+    backend = args.backend or ("gurobi" if _has_gurobi() else "highs")
+    
+    # the options that change a result tell the runs apart in the store
+    params = {"backend": backend}
+    for key in ("threads", "timelimit", "seed"):
+        if getattr(args, key) is not None:
+            params[key] = getattr(args, key)
+    if args.decompose:
+        params["decompose"] = True
+    
+    results = open_results(args.results)
+    done = results_done(results, params)
+    if args.method:
+        jobs = [(name, method) for name in names for method in args.method]
+    else:
+        jobs = [job for name in names for job in runner.jobs_for(name)]
+    jobs = [job for job in jobs if job not in done]
+    for job in jobs:
+        if job[1] in runner.unsupported[backend]:
+            print(job[0], job[1], 'unsupported by', backend)
+    jobs = [job for job in jobs if job[1] not in runner.unsupported[backend]]
+    
+    failed = 0
+    for job, result in runner.run_batch(jobs, workers=args.jobs, threads=args.threads, backend=backend, timelimit=args.timelimit,
+                                        seed=args.seed, decompose=args.decompose):
+        add_result(results, job, params, result)
+        print(job[0], job[1], 'status', result["status"], 'objective', result["solobj"], 'bound', result["solBound"], 'time', result["timerun"])
+        failed += bool(np.isnan(result["status"]))
+    results.close()
+    
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    
+    sys.exit(main())
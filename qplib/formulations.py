@@ -0,0 +1,629 @@
+# -*- coding: utf-8 -*-
+"""
+The QP and its formulations over binaries, built as QPModels and solved
+with a backend
+"""
+
+import os
+import numpy as np
+import scipy.sparse as sp
+
+from qplib.backends import solve_model
+from qplib.heuristics import tabu_search
+from qplib.model import QPModel, _failed_result
+from qplib.presolve import presolve_QBL, split_QBL, _binary_objective, _unfix
+
+
+######################
+#
+#  Formulations
+#
+# Each build function writes a formulation of the problem into a QPModel;
+# the binary ones are registered by name in formulations and solved by
+# solve_formulation, the problem presolved first. solve_decomposed solves
+# the independent blocks of a problem apart.
+
+
+def _eigmin(S):
+    
+    # the smallest eigenvalue of the symmetric S over the rows and columns
+    # with nonzeros (0 without any)
+    S = sp.csr_matrix(S)
+    support = np.unique(S.nonzero()[0])
+    if len(support) == 0:
+        return 0.0
+    
+    S = S[support][:,support]
+    if len(support) <= 2000:
+        return np.linalg.eigvalsh(S.toarray())[0]
+    from scipy.sparse.linalg import eigsh
+    return eigsh(S, k=1, which='SA', return_eigenvectors=False)[0]
+
+
+def _is_convex(L, sign=1):
+    
+    # True when sign * 1/2 x^t L x is convex, i.e. the symmetric part of
+    # sign * L is positive semidefinite; only the rows and columns with
+    # nonzeros matter
+    
+    L = sp.csr_matrix(L)
+    S = 0.5*sign*(L + L.transpose())
+    if S.nnz == 0:
+        return True
+    
+    return _eigmin(S) >= -1e-9*max(1.0, abs(S).max())
+
+
+def build_QP(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,l=None,u=None,vtype=None,Qc=None,start=None):
+    
+    # the QP itself: by default every variable is binary and every
+    # constraint linear (QBL); l, u, vtype and Qc of a QPLIBProblem give
+    # the general problem
+    if l is None:
+        l = np.zeros(n)
+    if u is None:
+        u = np.ones(n)
+    if vtype is None:
+        vtype = np.full(n, 'B')
+    if Qc is None:
+        Qc = {}
+
+    model = QPModel(name[0], sense[0][0])
+    model.addVars("x", n, lb=l, ub=u, vtype=vtype, obj=b0)
+    model.constant = q0
+    model.Q = sp.csr_matrix(Q0)
+    if start is not None:
+        model.start[:n] = start
+    
+    # constraints
+    A0 = sp.csr_matrix(A0)
+    linear = np.array([i not in Qc for i in range(m)], dtype=bool)
+    model.addRows(A0[linear], ccl[linear], ccu[linear])
+    
+    # quadratic constraints, 1/2 x^t Qc_i x + A0_i x
+    for i in Qc:
+        model.qrows[i] = (Qc[i], A0[i], ccl[i], ccu[i])
+    
+    # a nonconvex objective or quadratic row needs a global solver; over
+    # binaries only the objective is linearized by the solver, and its
+    # eigenvalue is not needed
+    if np.all(np.asarray(vtype) == 'B'):
+        model.nonconvex = False
+    elif 'minimize' == model.sense:
+        model.nonconvex = not _is_convex(Q0, 1)
+    else:
+        model.nonconvex = not _is_convex(Q0, -1)
+    for i in Qc:
+        if np.isfinite(ccu[i]) and not _is_convex(Qc[i], 1):
+            model.nonconvex = True
+        if np.isfinite(ccl[i]) and not _is_convex(Qc[i], -1):
+            model.nonconvex = True
+    
+    return model
+
+
+def _triangles(pi, pj, n):
+    
+    # the triples i < j < l whose three pairs are all products, as the
+    # indices of the products ij, il and jl
+    product = {(i, j): p for p, (i, j) in enumerate(zip(pi.tolist(), pj.tolist()))}
+    neighbours = [set() for _ in range(n)]
+    for i, j in product:
+        neighbours[i].add(j)
+    
+    triples = [(i, j, l) for i, j in product for l in neighbours[i] & neighbours[j]]
+    
+    return np.array([[product[i, j], product[i, l], product[j, l]] for i, j, l in triples], dtype=int).reshape(-1, 3), np.array(triples, dtype=int).reshape(-1, 3)
+
+
+def build_Glover_Woolsey(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,start=None,compact=False,lazy=False,triangles=False):
+    
+    # one product y_k = x_i x_j per nonzero Q0 entry above the diagonal
+    # (i < j); the pairs without a coefficient never reach the objective,
+    # and the diagonal goes to the linear term, x_i x_i = x_i
+    Q00 = sp.triu(sp.csr_matrix(Q0).transpose(), 1).tocsr()
+    Q00.eliminate_zeros()
+    Q00 = Q00.tocoo()
+    pi, pj = Q00.row, Q00.col
+    k = Q00.nnz
+
+    # y_k - x_i, y_k - x_j and y_k - x_i - x_j as k x n selections of x
+    Ei = sp.csr_matrix((np.ones(k), (np.arange(k), pi)), shape=(k,n))
+    Ej = sp.csr_matrix((np.ones(k), (np.arange(k), pj)), shape=(k,n))
+    Ik = sp.identity(k, format='csr')
+
+    model = QPModel(name[0], sense[0][0])
+    
+    # variables: x then y, the column order of the matrices below; the
+    # compact and lazy models bound y by 0 <= y <= 1 instead of the row
+    # y >= 0
+    model.addVars("x", n, lb=0.0, ub=1.0, vtype='B', obj=b0 + 0.5*sp.csr_matrix(Q0).diagonal())
+    if compact or lazy:
+        model.addVars("y", k, lb=0.0, ub=1.0, obj=0.5*Q00.data)
+    else:
+        model.addVars("y", k, lb=-np.inf, ub=np.inf, obj=0.5*Q00.data)
+    model.constant = q0
+    
+    # a start x gives y_k = x_i x_j
+    if start is not None:
+        model.start[:n] = start
+        model.start[n:] = start[pi]*start[pj]
+    
+    if compact:
+        # half McCormick: the objective pushes y_k down where its
+        # coefficient is positive (minimize) or negative (maximize), and
+        # only y_k >= x_i + x_j - 1 holds it up; up elsewhere, where only
+        # y_k <= x_i and y_k <= x_j hold it down
+        sign = 1 if 'minimize' == model.sense else -1
+        down = sign*Q00.data > 0
+        up = ~down
+        model.addRows(sp.hstack([-Ei[up], Ik[up]]), -np.inf, 0.0, lazy=lazy)
+        model.addRows(sp.hstack([-Ej[up], Ik[up]]), -np.inf, 0.0, lazy=lazy)
+        model.addRows(sp.hstack([-Ei[down] - Ej[down], Ik[down]]), -1.0, np.inf, lazy=lazy)
+    else:
+        # const 1-4; with lazy, y >= 0 is the bound
+        model.addRows(sp.hstack([-Ei, Ik]), -np.inf, 0.0, lazy=lazy)
+        model.addRows(sp.hstack([-Ej, Ik]), -np.inf, 0.0, lazy=lazy)
+        model.addRows(sp.hstack([-Ei - Ej, Ik]), -1.0, np.inf, lazy=lazy)
+        if not lazy:
+            model.addRows(sp.hstack([sp.csr_matrix((k,n)), Ik]), 0.0, np.inf)
+    
+    # triangle inequalities on every triple i < j < l of products, always
+    # lazy: x_i + x_j + x_l - y_ij - y_il - y_jl <= 1 and, for each of
+    # i, j, l, the two products with it minus the third <= that x
+    if triangles:
+        Y, X = _triangles(pi, pj, n)
+        t = len(Y)
+        rows = np.repeat(np.arange(4*t).reshape(4, t), 3, axis=0).ravel()
+        ycols = np.concatenate([Y[:, 0], Y[:, 1], Y[:, 2],
+                                Y[:, 0], Y[:, 1], Y[:, 2],
+                                Y[:, 0], Y[:, 2], Y[:, 1],
+                                Y[:, 1], Y[:, 2], Y[:, 0]])
+        yvals = np.repeat([-1.0, -1.0, -1.0, 1.0, 1.0, -1.0, 1.0, 1.0, -1.0, 1.0, 1.0, -1.0], t)
+        xrows = np.concatenate([np.arange(t), np.arange(t), np.arange(t), t + np.arange(t), 2*t + np.arange(t), 3*t + np.arange(t)])
+        xcols = np.concatenate([X[:, 0], X[:, 1], X[:, 2], X[:, 0], X[:, 1], X[:, 2]])
+        xvals = np.repeat([1.0, 1.0, 1.0, -1.0, -1.0, -1.0], t)
+        T = sp.csr_matrix((np.concatenate([xvals, yvals]), (np.concatenate([xrows, rows]), np.concatenate([xcols, n + ycols]))), shape=(4*t, n + k))
+        model.addRows(T, -np.inf, np.concatenate([np.ones(t), np.zeros(3*t)]), lazy=True)
+    
+    # constraints
+    model.addRows(A0, ccl, ccu)
+    
+    return model
+
+
+def _glover_bounds_columns(Q00, A, rl, ru, columns, sign):
+    
+    # for every column j: the min (sign 1) or max (sign -1) of
+    # sum_i Q00[i,j] x_i with x_j = 1, and the opposite with x_j = 0, over
+    # the LP relaxation of the rows; nan when the LP is not solved
+    from scipy.optimize import linprog
+    
+    n = Q00.shape[0]
+    A_ub = sp.vstack([A[np.isfinite(ru)], -A[np.isfinite(rl)]]).tocsr()
+    b_ub = np.concatenate([ru[np.isfinite(ru)], -rl[np.isfinite(rl)]])
+    if A_ub.shape[0] == 0:
+        A_ub = b_ub = None
+    
+    bound1 = np.full(len(columns), np.nan)
+    bound0 = np.full(len(columns), np.nan)
+    for k, j in enumerate(columns):
+        c = Q00[j].toarray().ravel()
+        bounds = np.column_stack([np.zeros(n), np.ones(n)])
+        
+        bounds[j] = 1.0
+        res = linprog(sign*c, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method='highs')
+        if res.status == 0:
+            bound1[k] = sign*res.fun
+        
+        bounds[j] = 0.0
+        res = linprog(-sign*c, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method='highs')
+        if res.status == 0:
+            bound0[k] = -sign*res.fun
+    
+    return bound1, bound0
+
+
+def tighten_Glover_bounds(Q00, A0, ccl, ccu, sense, Qmas, Qmenos, workers=None):
+    
+    '''
+    The bounds of sum_i Q00[i,j] x_i in Glover's model from the LP
+    relaxation of ccl <= A0 x <= ccu, in place of the row sums Qmas and
+    Qmenos. Only the value of x_j where a bound is used matters: for a
+    minimization Qmenos_j is the minimum with x_j = 1 and Qmas_j the
+    maximum with x_j = 0, for a maximization Qmas_j is the maximum with
+    x_j = 1 and Qmenos_j the minimum with x_j = 0. The 2n LPs are split
+    over workers processes; by default all the cores, or none (one after
+    the other) in a worker process of run_batch, run_race or
+    solve_decomposed, whose cores the other workers already use. A bound
+    whose LP fails keeps its row sum.
+    '''
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing as mp
+    
+    n = Q00.shape[0]
+    A0 = sp.csr_matrix(A0)
+    sign = 1 if 'minimize' == sense else -1
+    
+    if workers is None:
+        workers = 1 if mp.parent_process() is not None else (os.cpu_count() or 1)
+    chunks = [chunk for chunk in np.array_split(np.arange(n), workers) if len(chunk) > 0]
+    
+    if len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            parts = list(pool.map(_glover_bounds_columns, *zip(*[(Q00, A0, ccl, ccu, chunk, sign) for chunk in chunks])))
+    else:
+        parts = [_glover_bounds_columns(Q00, A0, ccl, ccu, chunk, sign) for chunk in chunks]
+    
+    bound1 = np.concatenate([part[0] for part in parts]) if parts else np.zeros(0)
+    bound0 = np.concatenate([part[1] for part in parts]) if parts else np.zeros(0)
+    
+    # a little room for the LP tolerances, so that the bounds stay valid
+    room = 1e-6*(1.0 + np.abs(np.nan_to_num(bound1))), 1e-6*(1.0 + np.abs(np.nan_to_num(bound0)))
+    if sign == 1:
+        Qmenos = np.where(np.isnan(bound1), Qmenos, np.maximum(Qmenos, bound1 - room[0]))
+        Qmas = np.where(np.isnan(bound0), Qmas, np.minimum(Qmas, bound0 + room[1]))
+    else:
+        Qmas = np.where(np.isnan(bound1), Qmas, np.minimum(Qmas, bound1 + room[0]))
+        Qmenos = np.where(np.isnan(bound0), Qmenos, np.maximum(Qmenos, bound0 - room[1]))
+    
+    return Qmas, Qmenos
+
+
+def build_Glover(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,tighten=False,start=None,workers=None):
+    
+    # w_j stands for x_j * sum_i Q00[i,j] x_i, Q00 the symmetric 1/4 (Q0 + Q0^t)
+    Q00 = 0.25*sp.csr_matrix(Q0)
+    Q00 = (Q00 + Q00.transpose()).tocsr()
+
+    # bounds of sum_i Q00[i,j] x_i over x in {0,1}^n
+    Qmas = np.asarray(Q00.maximum(0).sum(axis=1)).ravel()
+    Qmenos = np.asarray(Q00.minimum(0).sum(axis=1)).ravel()
+
+    #Qmas     = np.array([sum(Q00[i,j] for i in range(n) if i!=j and Q00[i,j] > 0 ) for j in range(n)]) 
+    #Qmenos   = np.array([sum(Q00[i,j] for i in range(n) if i!=j and Q00[i,j] < 0 ) for j in range(n)]) 
+
+    # or tighter ones under the rows, see tighten_Glover_bounds
+    if tighten:
+        Qmas, Qmenos = tighten_Glover_bounds(Q00, A0, ccl, ccu, sense[0][0], Qmas, Qmenos, workers=workers)
+
+    In = sp.identity(n, format='csr')
+
+    model = QPModel(name[0], sense[0][0])
+    
+    # variables: x then w, the column order of the matrices below
+    model.addVars("x", n, lb=0.0, ub=1.0, vtype='B', obj=b0)
+    model.addVars("w", n, lb=-np.inf, ub=np.inf, obj=1.0)
+    model.constant = q0
+    
+    # a start x gives w_j = x_j * sum_i Q00[i,j] x_i
+    if start is not None:
+        model.start[:n] = start
+        model.start[n:] = start*(Q00.transpose() @ start)
+    
+    # w_j - Qmenos_j x_j >= 0  and  w_j - sum_i Q00[i,j] x_i - Qmas_j x_j >= -Qmas_j
+    # (minimize), or the same with Qmas and Qmenos swapped and <= (maximize)
+    if 'minimize' == model.sense:
+        model.addRows(sp.hstack([-sp.diags(Qmenos), In]), 0.0, np.inf)
+        model.addRows(sp.hstack([-Q00.transpose() - sp.diags(Qmas), In]), -Qmas, np.inf)
+    else:
+        model.addRows(sp.hstack([-sp.diags(Qmas), In]), -np.inf, 0.0)
+        model.addRows(sp.hstack([-Q00.transpose() - sp.diags(Qmenos), In]), -np.inf, -Qmenos)
+
+    # constraints
+    model.addRows(A0, ccl, ccu)
+    
+    return model
+
+
+def build_RLT(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,start=None):
+    
+    # first-level RLT: the McCormick products y_k = x_i x_j of the
+    # objective and, for every row with a finite side, the row times x_j
+    # and times 1 - x_j for j in the row and its neighbours in Q0, with
+    # x_j x_j = x_j and the products of the row as new y
+    L, b = _binary_objective(Q0, b0)
+    A0 = sp.csr_matrix(A0)
+    Lc = L.tocoo()
+    neighbours = (L + L.transpose()).tocsr()
+    
+    # the (row, multiplier) pairs t, with R[t] the row and J[t] the x_j
+    R, J = [np.zeros(0, dtype=int)], [np.zeros(0, dtype=int)]
+    for r in np.flatnonzero(np.isfinite(ccl) | np.isfinite(ccu)):
+        support = A0.indices[A0.indptr[r]:A0.indptr[r+1]]
+        multipliers = np.union1d(support, neighbours[support].indices)
+        R.append(np.full(len(multipliers), r))
+        J.append(multipliers)
+    R, J = np.concatenate(R), np.concatenate(J)
+    t = len(R)
+    
+    # the terms a_ri x_i x_j of the products, as (t, i, a_ri)
+    P = A0[R].tocoo()
+    jj = J[P.row]
+    square = P.col == jj
+    hi = np.maximum(P.col, jj)[~square].astype(np.int64)
+    lo = np.minimum(P.col, jj)[~square].astype(np.int64)
+    
+    # one y per pair (i > j, as in L) of the objective or of a product
+    keys = np.union1d(Lc.row.astype(np.int64)*n + Lc.col, hi*n + lo)
+    k = len(keys)
+    pi, pj = keys // n, keys % n
+    
+    model = QPModel(name[0], sense[0][0])
+    
+    # variables: x then y
+    model.addVars("x", n, lb=0.0, ub=1.0, vtype='B', obj=b)
+    cy = np.zeros(k)
+    cy[np.searchsorted(keys, Lc.row.astype(np.int64)*n + Lc.col)] = 0.5*Lc.data
+    model.addVars("y", k, lb=0.0, ub=1.0, obj=cy)
+    model.constant = q0
+    
+    # a start x gives y_k = x_i x_j
+    if start is not None:
+        model.start[:n] = start
+        model.start[n:] = start[pi]*start[pj]
+    
+    # McCormick: y_k <= x_i, y_k <= x_j, y_k >= x_i + x_j - 1
+    Ei = sp.csr_matrix((np.ones(k), (np.arange(k), pi)), shape=(k,n))
+    Ej = sp.csr_matrix((np.ones(k), (np.arange(k), pj)), shape=(k,n))
+    Ik = sp.identity(k, format='csr')
+    model.addRows(sp.hstack([-Ei, Ik]), -np.inf, 0.0)
+    model.addRows(sp.hstack([-Ej, Ik]), -np.inf, 0.0)
+    model.addRows(sp.hstack([-Ei - Ej, Ik]), -1.0, np.inf)
+    
+    # F_t = a_R[t] x x_J[t] over x and y, Xj_t = x_J[t], Ar_t = a_R[t] x
+    F = sp.csr_matrix((np.concatenate([P.data[square], P.data[~square]]),
+                       (np.concatenate([P.row[square], P.row[~square]]),
+                        np.concatenate([jj[square], n + np.searchsorted(keys, hi*n + lo)]))), shape=(t, n+k))
+    Xj = sp.csr_matrix((np.ones(t), (np.arange(t), J)), shape=(t, n+k))
+    Ar = sp.hstack([A0[R], sp.csr_matrix((t, k))]).tocsr()
+    
+    # (a x - l) x_j >= 0 and (a x - l)(1 - x_j) >= 0, the same with u and
+    # <=, and one equality for l = u
+    l, u = ccl[R], ccu[R]
+    lower, upper = np.isfinite(l), np.isfinite(u)
+    equal = lower & upper & (l == u)
+    upper = upper & ~equal
+    l, u = np.where(lower, l, 0.0), np.where(upper | equal, u, 0.0)
+    
+    model.addRows((F - sp.diags(l) @ Xj)[lower], 0.0, np.where(equal, 0.0, np.inf)[lower])
+    model.addRows((Ar - F + sp.diags(l) @ Xj)[lower], l[lower], np.where(equal, l, np.inf)[lower])
+    model.addRows((F - sp.diags(u) @ Xj)[upper], -np.inf, 0.0)
+    model.addRows((Ar - F + sp.diags(u) @ Xj)[upper], -np.inf, u[upper])
+    
+    # constraints
+    model.addRows(A0, ccl, ccu)
+    
+    return model
+
+
+def build_QCR(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,start=None,shift="eig"):
+    
+    # the objective made convex (concave for a maximization) with
+    # d_i (x_i^2 - x_i) = 0: 1/2 x^t (S + D) x + (b - d/2)^t x, S the
+    # symmetric part of the strictly lower L and D = diag(d) from the
+    # smallest eigenvalue of S (shift "eig", the same d_i for every i) or
+    # from the Gershgorin discs of S (shift "gershgorin", row by row)
+    L, b = _binary_objective(Q0, b0)
+    sign = 1 if 'minimize' == sense[0][0] else -1
+    S = 0.5*sign*(L + L.transpose())
+    
+    if shift == "eig":
+        d = np.full(n, max(0.0, -_eigmin(S)))
+    elif shift == "gershgorin":
+        d = np.asarray(abs(S).sum(axis=1)).ravel()
+    else:
+        raise ValueError("shift must be 'eig' or 'gershgorin', not %r" % (shift,))
+    # a little room, so that the solver finds the matrix semidefinite
+    d = np.where(d > 0, d + 1e-6*(1.0 + d), 0.0)
+    
+    model = QPModel(name[0], sense[0][0])
+    model.addVars("x", n, lb=0.0, ub=1.0, vtype='B', obj=b - 0.5*sign*d)
+    model.constant = q0
+    model.Q = (L + sign*sp.diags(d)).tocsr()
+    if start is not None:
+        model.start[:n] = start
+    
+    # constraints
+    model.addRows(A0, ccl, ccu)
+    
+    return model
+
+
+formulations = {"GW": build_Glover_Woolsey, "G": build_Glover, "RLT": build_RLT, "QCR": build_QCR}
+
+
+def _binary_start(start, fixed, Q0,b0,A0,ccl,ccu,sense,heuristic,seed=None):
+    
+    # the start on the variables kept by the presolve, improved by heuristic
+    # seconds of tabu search from it (with seed, 0 by default)
+    if start is not None:
+        start = np.round(np.asarray(start, dtype=float)[np.isnan(fixed)])
+    if heuristic > 0:
+        x, obj = tabu_search(Q0,b0,A0,ccl,ccu,sense[0][0],x0=start,timelimit=heuristic,seed=0 if seed is None else seed)
+        if x is not None:
+            start = x
+    
+    return start
+
+
+def solve_QP_gurobi(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,l=None,u=None,vtype=None,Qc=None,backend="gurobi",timelimit=1000,threads=None,lpfile="poolsearch.lp",start=None,seed=None):
+    import time
+    
+    start_time = time.time()
+    model = build_QP(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,l=l,u=u,vtype=vtype,Qc=Qc,start=start)
+    
+    result = solve_model(model, backend, timelimit, lpfile, False, time.time() - start_time, threads, seed=seed)
+    result["solrelax"] = np.nan
+    
+    return result
+
+
+def solve_formulation(formulation,name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,backend="gurobi",timelimit=600,threads=None,lpfile=None,relax="root",presolve=True,heuristic=0,start=None,seed=None,**options):
+    import time
+    
+    # a binary problem through the formulation of formulations: presolve,
+    # MIP start, build with options, solve, solution on the variables of
+    # the problem
+    start_time = time.time()
+    fixed = np.full(n, np.nan)
+    if presolve:
+        problem, fixed = presolve_QBL(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu)
+        name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu = problem
+    start = _binary_start(start, fixed, Q0,b0,A0,ccl,ccu,sense,heuristic,seed)
+    presolvetime = time.time() - start_time
+    
+    start_time = time.time()
+    model = formulations[formulation](name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,start=start,**options)
+    model.fixed = fixed
+    
+    result = solve_model(model, backend, timelimit, lpfile, relax, time.time() - start_time, threads, presolvetime, seed)
+    
+    # the objective of x on the problem itself, free of the tolerances of
+    # the formulation (the room of the tightened Glover bounds)
+    if result["x"] is not None:
+        x = np.round(result["x"])
+        result["solobj"] = float(0.5*x @ (sp.csr_matrix(Q0) @ x) + b0 @ x + q0)
+        if np.isfinite(result["solBound"]):
+            result["gapmip"] = abs(result["solobj"] - result["solBound"])/max(abs(result["solobj"]), 1e-10)
+        if result["trajectory"]:
+            runtime, incumbent, bound = result["trajectory"][-1]
+            result["trajectory"][-1] = (runtime, result["solobj"], bound)
+    result["x"] = _unfix(result["x"], fixed)
+    
+    return result
+
+
+def solve_Glover_Woolsey_gurobi(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,backend="gurobi",timelimit=600,threads=None,lpfile="poolsearch_GW.lp",relax="root",presolve=True,heuristic=0,start=None,compact=False,lazy=False,triangles=False,seed=None):
+    
+    return solve_formulation("GW",name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,backend=backend,timelimit=timelimit,threads=threads,lpfile=lpfile,relax=relax,presolve=presolve,heuristic=heuristic,start=start,seed=seed,compact=compact,lazy=lazy,triangles=triangles)
+
+
+def solve_Glover_gurobi(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,backend="gurobi",timelimit=600,threads=None,lpfile="poolsearch_G.lp",relax="root",presolve=True,tighten=False,heuristic=0,start=None,seed=None):
+    
+    # the LPs of tighten within the threads of the job
+    return solve_formulation("G",name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,backend=backend,timelimit=timelimit,threads=threads,lpfile=lpfile,relax=relax,presolve=presolve,heuristic=heuristic,start=start,seed=seed,tighten=tighten,workers=threads)
+
+
+def solve_RLT_gurobi(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,backend="gurobi",timelimit=600,threads=None,lpfile="poolsearch_RLT.lp",relax="root",presolve=True,heuristic=0,start=None,seed=None):
+    
+    return solve_formulation("RLT",name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,backend=backend,timelimit=timelimit,threads=threads,lpfile=lpfile,relax=relax,presolve=presolve,heuristic=heuristic,start=start,seed=seed)
+
+
+def solve_QCR_gurobi(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,backend="gurobi",timelimit=600,threads=None,lpfile="poolsearch_QCR.lp",relax="root",presolve=True,heuristic=0,start=None,shift="eig",seed=None):
+    
+    # a convex MIQP, for the gurobi backend only
+    return solve_formulation("QCR",name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,backend=backend,timelimit=timelimit,threads=threads,lpfile=lpfile,relax=relax,presolve=presolve,heuristic=heuristic,start=start,seed=seed,shift=shift)
+
+
+def _merge_blocks(nameproblem, n, fixed, blocks, results, runtime):
+    
+    # one result from the results of the blocks: the sums of the
+    # objectives, bounds and sizes, the solution on the variables of the
+    # problem, optimal when every block is, infeasible when one is
+    result = _failed_result(nameproblem)
+    for key in ("solobj", "solBound", "solrelax", "timeload", "timepresolve", "timebuild", "numvars", "numrows", "numnz"):
+        result[key] = float(np.sum([r[key] for r in results]))
+    
+    statuses = [r["status"] for r in results]
+    if all(status == 2 for status in statuses):
+        result["status"] = 2
+    elif 3 in statuses:
+        result["status"] = 3
+    else:
+        result["status"] = next(status for status in statuses if status != 2)
+    if np.isfinite(result["solobj"]) and np.isfinite(result["solBound"]):
+        result["gapmip"] = abs(result["solobj"] - result["solBound"])/max(abs(result["solobj"]), 1e-10)
+    
+    if all(r["x"] is not None for r in results):
+        x = np.zeros(int(np.sum(np.isnan(fixed))))
+        for (problem, columns), r in zip(blocks, results):
+            x[columns] = r["x"]
+        result["x"] = _unfix(x, fixed)
+    
+    result["timerun"] = runtime
+    if np.isfinite(result["solobj"]):
+        result["trajectory"] = [(runtime, result["solobj"], result["solBound"])]
+    result["blocks"] = len(blocks)
+    
+    return result
+
+
+def solve_decomposed(formulation,name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,workers=None,threads=None,timelimit=600,presolve=True,start=None,**options):
+    
+    '''
+    Solve a binary problem block by block: presolve it, split it into its
+    independent blocks (split_QBL) and solve each with the formulation of
+    formulations, on workers processes at once (one per block by default,
+    as many as the cores), the cores split between the workers unless
+    threads is given. With workers 1 the blocks are solved one after the
+    other in this process. The blocks share timelimit: a block that starts
+    gets the time left split over the rounds of workers the blocks not
+    started yet need, so the time a block does not use goes to the next
+    ones. options go to solve_formulation.
+    
+    Returns one result, as solve_formulation: the objective, bound and
+    relaxation the sums of the ones of the blocks, x on the variables of
+    the problem, timerun the wall-clock time of the blocks and blocks their
+    number. A problem of one block is solved as by solve_formulation.
+    '''
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    import time
+    
+    start_time = time.time()
+    fixed = np.full(n, np.nan)
+    if presolve:
+        problem, fixed = presolve_QBL(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu)
+    else:
+        problem = (name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu)
+    blocks = split_QBL(*problem)
+    presolvetime = time.time() - start_time
+    
+    if start is not None:
+        start = np.asarray(start, dtype=float)[np.isnan(fixed)]
+    
+    # one block: the problem presolved above, as solve_formulation would
+    if len(blocks) <= 1:
+        result = solve_formulation(formulation,*problem,threads=threads,timelimit=timelimit,presolve=False,start=start,**options)
+        result["x"] = _unfix(result["x"], fixed)
+        result["timepresolve"] += presolvetime
+        result["timeload"] += presolvetime
+        result["blocks"] = len(blocks)
+        return result
+    
+    cores = os.cpu_count() or 1
+    workers = min(workers or cores, len(blocks))
+    if threads is None:
+        threads = max(1, cores // workers)
+    options.update(threads=threads, presolve=False, lpfile=None)
+    
+    start_time = time.time()
+    end = start_time + timelimit
+    
+    def limit(k):
+        # the time of block k when it starts
+        return max(end - time.time(), 0.0)/np.ceil((len(blocks) - k)/workers)
+    
+    if workers == 1:
+        results = []
+        for k, (block, columns) in enumerate(blocks):
+            results.append(solve_formulation(formulation, *block, start=None if start is None else start[columns], timelimit=limit(k), **options))
+    else:
+        # at most workers blocks submitted, the next one when one ends
+        results = [None]*len(blocks)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            running = {}
+            for k, (block, columns) in enumerate(blocks):
+                if len(running) == workers:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+                running[pool.submit(solve_formulation, formulation, *block, start=None if start is None else start[columns], timelimit=limit(k), **options)] = k
+            for future in running:
+                results[running[future]] = future.result()
+    runtime = time.time() - start_time
+    
+    result = _merge_blocks(name[0], n, fixed, blocks, results, runtime)
+    result["timepresolve"] += presolvetime
+    
+    return result
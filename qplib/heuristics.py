@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Heuristics for the binary problems
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from qplib.model import _failed_result
+from qplib.presolve import _binary_objective
+
+
+######################
+#
+#  Heuristics
+#
+# tabu_search works on the sparse data of readaQP for binary problems and
+# never builds a model: it gives the standalone method solve_tabu and the
+# MIP starts of the linearizations (keyword heuristic).
+
+
+def _violation(act, rl, ru):
+    
+    # how far each row activity is out of [rl, ru]
+    return np.maximum(rl - act, 0.0) + np.maximum(act - ru, 0.0)
+
+
+def tabu_search(Q0, b0, A0, ccl, ccu, sense, x0=None, timelimit=10, iterations=None, seed=0):
+    
+    '''
+    1-flip tabu search for min/max 1/2 x^t Q0 x + b0^t x over x in {0,1}^n
+    with ccl <= A0 x <= ccu. Each iteration flips the best variable that is
+    not tabu (or that gives a new best feasible point), scoring the rows by
+    their violation times a penalty that adapts to how often the search is
+    feasible. The gains b + 1/2 S x (S the symmetric Q0 without diagonal),
+    the row activities A0 x and the change of the violation under every
+    flip are kept up to date: a move touches the neighbours of the flipped
+    variable in S, its rows, and the variables of those rows only. Picking
+    the move is one vectorized pass over the n scores.
+    
+    Starts from x0 (zeros by default) and stops after timelimit seconds or
+    iterations moves. Returns the best feasible x found, None if there was
+    none, and its objective (without q0).
+    '''
+    import time
+    
+    start_time = time.time()
+    rng = np.random.default_rng(seed)
+    
+    # the search minimizes sign * objective
+    sign = 1.0 if 'minimize' == sense else -1.0
+    L, b = _binary_objective(Q0, b0)
+    S = (sign*(L + L.transpose())).tocsc()
+    b = sign*b
+    n = len(b)
+    
+    # A by columns, for the rows of a flipped variable, and its entries
+    # (R, C, V) in the order of A by rows, for the variables of a row
+    A = sp.csc_matrix(A0)
+    Ar = sp.csr_matrix(A0)
+    Ar.sum_duplicates()
+    R, C, V = np.repeat(np.arange(Ar.shape[0]), np.diff(Ar.indptr)), Ar.indices, Ar.data
+    rl, ru = np.asarray(ccl, dtype=float), np.asarray(ccu, dtype=float)
+    
+    x = np.zeros(n) if x0 is None else np.round(np.clip(x0, 0, 1))
+    
+    def exact(x):
+        # gains, activities, objective and violation from scratch, and
+        # the change of the violation of each entry's row when its
+        # variable flips, summed by variable in dviol
+        g = b + 0.5*(S @ x)
+        act = A @ x
+        s = 1.0 - 2.0*x
+        contrib = _violation(act[R] + s[C]*V, rl[R], ru[R]) - _violation(act[R], rl[R], ru[R])
+        dviol = np.bincount(C, weights=contrib, minlength=n)
+        return g, act, b @ x + 0.25*(x @ (S @ x)), _violation(act, rl, ru).sum(), s, s*g, contrib, dviol
+    
+    g, act, f, viol, s, dobj, contrib, dviol = exact(x)
+    
+    best, bestf = None, np.inf
+    if viol <= 1e-6:
+        best, bestf = x.copy(), f
+    
+    tenure = max(1, min(20, n // 4))
+    tabu = np.zeros(n, dtype=int)
+    mu = 1.0
+    feasible = 0
+    
+    it = 0
+    while n > 0 and (iterations is None or it < iterations):
+        
+        # the best move allowed, ties broken at random
+        aspire = (viol + dviol <= 1e-6) & (f + dobj < bestf - 1e-9)
+        score = np.where((tabu <= it) | aspire, dobj + mu*dviol, np.inf)
+        if not np.isfinite(score).any():
+            score = dobj + mu*dviol
+        i = rng.choice(np.flatnonzero(score <= score.min() + 1e-12))
+        
+        # flip x_i: its column of S changes the gains of its neighbours,
+        # its column of A the activities of its rows, and these the
+        # violation changes of the entries of those rows
+        f += dobj[i]
+        viol += dviol[i]
+        x[i] = 1.0 - x[i]
+        col = slice(S.indptr[i], S.indptr[i+1])
+        neighbours = S.indices[col]
+        g[neighbours] += 0.5*s[i]*S.data[col]
+        
+        col = slice(A.indptr[i], A.indptr[i+1])
+        rows = A.indices[col]
+        lens = Ar.indptr[rows + 1] - Ar.indptr[rows]
+        K = np.repeat(Ar.indptr[rows] - np.cumsum(lens) + lens, lens) + np.arange(lens.sum())
+        np.subtract.at(dviol, C[K], contrib[K])
+        act[rows] += s[i]*A.data[col]
+        
+        s[i] = -s[i]
+        dobj[neighbours] = s[neighbours]*g[neighbours]
+        dobj[i] = s[i]*g[i]
+        contrib[K] = _violation(act[R[K]] + s[C[K]]*V[K], rl[R[K]], ru[R[K]]) - _violation(act[R[K]], rl[R[K]], ru[R[K]])
+        np.add.at(dviol, C[K], contrib[K])
+        tabu[i] = it + tenure + rng.integers(0, tenure + 1)
+        
+        if viol <= 1e-6:
+            feasible += 1
+            if f < bestf - 1e-9:
+                best, bestf = x.copy(), f
+        
+        it += 1
+        if it % 10 == 0:
+            # a heavier penalty while the search stays infeasible, a lighter
+            # one while it stays feasible, so that it crosses the boundary
+            # of the rows back and forth
+            if feasible == 0:
+                mu = min(2.0*mu, 1e12)
+            elif feasible == 10:
+                mu = max(1e-3, 0.5*mu)
+            feasible = 0
+        if it % 100 == 0:
+            # no drift in the updates
+            g, act, f, viol, s, dobj, contrib, dviol = exact(x)
+            if time.time() - start_time > timelimit:
+                break
+    
+    return best, sign*bestf
+
+
+def solve_tabu(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,timelimit=60,iterations=None,seed=0,start=None,backend=None,threads=None,lpfile=None):
+    
+    # tabu_search as a method, with the result dictionary of the solve
+    # functions; status 13 (suboptimal) when a feasible point was found.
+    # backend, threads and lpfile are taken for run_job and not used
+    import time
+    
+    start_time = time.time()
+    x, obj = tabu_search(Q0,b0,A0,ccl,ccu,sense[0][0],x0=start,timelimit=timelimit,iterations=iterations,seed=seed)
+    runtime = time.time() - start_time
+    
+    if x is None:
+        return dict(_failed_result(name[0]), timeload=0.0, timerun=runtime, timepresolve=0.0, timebuild=0.0)
+    
+    return dict(_failed_result(name[0]), timeload=0.0, timerun=runtime, timepresolve=0.0, timebuild=0.0,
+                solobj=obj + q0, status=13, x=x, trajectory=[(runtime, obj + q0, np.nan)])
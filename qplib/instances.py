@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+Reading of the QPLIB instances of qplib/, and the cache of the parsed ones
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import os
+import json
+import shutil
+import hashlib
+
+
+class QPLIBProblem(object):
+    
+    '''
+    All the data of a .qplib file, see readaQP. Unpacking it gives the
+    tuple name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu taken by the solve
+    functions.
+    '''
+    
+    def __init__(self, name, typee, sense, n, m, Q0, b0, q0, A0, ccl, ccu,
+                 Qc, cinfmas, l, u, vtype, x0, y0, z0, varnames, connames):
+        
+        self.name  = name               # problem name
+        self.typee = typee              # problem type, e.g. QBL
+        self.sense = sense              # minimize or maximize
+        self.n     = n                  # number of variables
+        self.m     = m                  # number of constraints
+        self.Q0    = Q0                 # sparse n x n, lower triangle of the objective
+        self.b0    = b0                 # array n, linear objective
+        self.q0    = q0                 # objective constant
+        self.A0    = A0                 # sparse m x n, linear part of the constraints
+        self.ccl   = ccl                # array m, constraint lower bounds
+        self.ccu   = ccu                # array m, constraint upper bounds
+        self.Qc    = Qc                 # dict constraint -> sparse n x n lower triangle
+        self.cinfmas = cinfmas          # value for infinity in the file
+        self.l     = l                  # array n, variable lower bounds
+        self.u     = u                  # array n, variable upper bounds
+        self.vtype = vtype              # array n of 'C', 'I' or 'B'
+        self.x0    = x0                 # array n, primal starting point
+        self.y0    = y0                 # array m, constraint duals of the starting point
+        self.z0    = z0                 # array n, bound duals of the starting point
+        self.varnames = varnames        # dict variable -> name (non-default only)
+        self.connames = connames        # dict constraint -> name (non-default only)
+    
+    def __iter__(self):
+        return iter(([self.name], [self.typee], [[self.sense]], self.n, self.m,
+                     self.Q0, self.b0, self.q0, self.A0, self.ccl, self.ccu))
+    
+    def linearizable(self):
+        
+        # all variables binary and linear constraints only: the Glover and
+        # Glover-Woolsey reformulations apply
+        return bool(np.all(self.vtype == 'B')) and len(self.Qc) == 0
+
+
+def _read_value(lines, pos):
+    
+    # first token of a "value # comment" header row, and the next row
+    return lines[pos].split()[0], pos + 1
+
+
+def _read_entries(lines, pos, nentries, ncols):
+    
+    # Bulk-tokenize the nentries rows of a pair/triplet section starting at
+    # lines[pos] into a (nentries x ncols) float array, and the next row.
+    
+    if nentries == 0:
+        return np.zeros((0, ncols)), pos
+    
+    term = np.loadtxt(lines[pos:pos + nentries], ndmin=2, usecols=range(ncols))
+    
+    return term, pos + nentries
+
+
+def _read_vector(lines, pos, size):
+    
+    # "default value", "number of non-default entries" and the (index, value)
+    # pairs, as a dense array of the given size
+    
+    value, pos = _read_value(lines, pos)
+    vector = np.full(size, float(value))
+    
+    value, pos = _read_value(lines, pos)
+    term, pos = _read_entries(lines, pos, int(value), 2)
+    vector[term[:,0].astype(np.int64)-1] = term[:,1]
+    
+    return vector, pos
+
+
+def _read_matrix(lines, pos, shape):
+    
+    # "number of entries" and the (row, column, value) triplets, as CSR
+    
+    value, pos = _read_value(lines, pos)
+    term, pos = _read_entries(lines, pos, int(value), 3)
+    matrix = sp.coo_matrix((term[:,2], (term[:,0].astype(np.int64)-1, term[:,1].astype(np.int64)-1)), shape=shape).tocsr()
+    
+    return matrix, pos
+
+
+def _read_names(lines, pos):
+    
+    # "number of non-default names" and the (index, name) rows
+    
+    value, pos = _read_value(lines, pos)
+    names = {}
+    for line in lines[pos:pos + int(value)]:
+        term = line.split(None, 1)
+        names[int(term[0])-1] = term[1].strip()
+    
+    return names, pos + int(value)
+
+
+def _quadratic_rows(cons, row, col, val, n):
+    
+    # one sparse n x n lower triangle per constraint from the 0-based
+    # quadruples (constraint, row, column, value); sorted once, every CSR
+    # is then sliced out directly instead of going through COO
+    
+    order = np.lexsort((col, row, cons))
+    cons, row, col, val = cons[order], row[order], col[order], val[order]
+    
+    Qc = {}
+    ids, first = np.unique(cons, return_index=True)
+    last = np.append(first[1:], len(cons))
+    for i, s, e in zip(ids, first, last):
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row[s:e], minlength=n), out=indptr[1:])
+        Qc[int(i)] = sp.csr_matrix((val[s:e], col[s:e], indptr), shape=(n,n))
+    
+    return Qc
+
+
+def readaQP(nameproblem, cache=True):
+    
+    '''
+    Read qplib/<nameproblem>.qplib, every section of the QPLIB format:
+    
+        min/max  1/2 x^t Q0 x + b0^t x + q0
+        
+        s.t.     ccl_i <= 1/2 x^t Qc_i x + A0_i x <= ccu_i
+                 l <= x <= u,  x_j continuous, integer or binary
+    
+    The problem type (e.g. QBL, LGQ, QCQ) says which sections the file has:
+    the first letter the objective (L linear), the second the variables
+    (C continuous, B binary, M binary and continuous, I integer, G general)
+    and the third the constraints (N none, B box, L linear, otherwise
+    quadratic). Q0 and Qc_i are kept as the lower triangle listed in the
+    file, and 1/2 x^t Q0 x is taken over these entries as they are, which
+    is how the solution values in instancedata.csv are obtained. Bounds
+    beyond the file's infinity become -inf/inf.
+    
+    With cache=True the parsed arrays are kept in cachepath and memory-mapped
+    on the next read of the same, unchanged file (see _cache_load).
+    
+    Returns a QPLIBProblem.
+    '''
+    
+    filepath = 'qplib/'
+    filepath += nameproblem
+    filepath += '.qplib'
+    
+    if cache:
+        problem = _cache_load(nameproblem, filepath)
+        if problem is not None:
+            return problem
+    
+    # the whole file is split into rows once; every section is then sliced
+    # out of it and tokenized as a block instead of row by row
+    
+    with open(filepath) as fp:
+        lines = fp.read().splitlines()
+    
+    name  = lines[0].strip()            # problem name
+    typee = lines[1].strip()            # problem type
+    sense = lines[2].split()[0].lower() # minimize or maximize
+    
+    ctype = typee[2]                    # constraint type
+    vtypee = typee[1]                   # variable type
+    
+    pos = 3
+    
+    value, pos = _read_value(lines, pos)
+    n = int(value)                      # number of variables
+    
+    m = 0                               # number of constraints
+    if ctype not in ('N', 'B'):
+        value, pos = _read_value(lines, pos)
+        m = int(value)
+    
+    # objective
+    
+    if typee[0] != 'L':
+        Q0, pos = _read_matrix(lines, pos, (n,n))
+    else:
+        Q0 = sp.csr_matrix((n,n))
+    
+    b0, pos = _read_vector(lines, pos, n)
+    
+    value, pos = _read_value(lines, pos)
+    q0 = float(value)
+    
+    # constraints
+    
+    Qc = {}
+    A0 = sp.csr_matrix((m,n))
+    
+    if m > 0:
+        if ctype != 'L':
+            value, pos = _read_value(lines, pos)
+            term, pos = _read_entries(lines, pos, int(value), 4)
+            
+            # quadruples (constraint, row, column, value)
+            Qc = _quadratic_rows(term[:,0].astype(np.int64)-1, term[:,1].astype(np.int64)-1, term[:,2].astype(np.int64)-1, term[:,3], n)
+        
+        A0, pos = _read_matrix(lines, pos, (m,n))
+    
+    # bounds
+    
+    cinfmas = np.inf                    # value for infinity
+    if m > 0 or vtypee != 'B':
+        value, pos = _read_value(lines, pos)
+        cinfmas = float(value)
+    
+    ccl = np.zeros(m)
+    ccu = np.zeros(m)
+    if m > 0:
+        ccl, pos = _read_vector(lines, pos, m)
+        ccu, pos = _read_vector(lines, pos, m)
+    
+    l = np.zeros(n)
+    u = np.ones(n)
+    if vtypee != 'B':
+        l, pos = _read_vector(lines, pos, n)
+        u, pos = _read_vector(lines, pos, n)
+    
+    for bound in (ccl, l):
+        bound[bound <= -cinfmas] = -np.inf
+    for bound in (ccu, u):
+        bound[bound >= cinfmas] = np.inf
+    
+    # variable types: 0 continuous, 1 integer, 2 binary
+    
+    if vtypee in ('M', 'G'):
+        vcode, pos = _read_vector(lines, pos, n)
+        vtype = np.array(['C', 'I', 'B'])[vcode.astype(np.int64)]
+    elif vtypee == 'C':
+        vtype = np.full(n, 'C')
+    elif vtypee == 'I':
+        vtype = np.full(n, 'I')
+    else:
+        vtype = np.full(n, 'B')
+    
+    vtype[(vtype == 'I') & (l >= 0) & (u <= 1)] = 'B'
+    
+    # starting point
+    
+    x0, pos = _read_vector(lines, pos, n)
+    
+    y0 = np.zeros(m)
+    if m > 0:
+        y0, pos = _read_vector(lines, pos, m)
+    
+    z0, pos = _read_vector(lines, pos, n)
+    
+    # names
+    
+    varnames, pos = _read_names(lines, pos)
+    connames, pos = _read_names(lines, pos)
+    
+    problem = QPLIBProblem(name, typee, sense, n, m, Q0, b0, q0, A0, ccl, ccu,
+                           Qc, cinfmas, l, u, vtype, x0, y0, z0, varnames, connames)
+    
+    if cache:
+        _cache_save(nameproblem, filepath, problem)
+    
+    return problem
+
+
+######################
+#
+#  Cache of parsed instances
+#
+# cachepath/<name>/ holds one .npy per array of the problem, memory-mapped
+# read-only on load, and meta.json with the scalars, the names and the size,
+# mtime and sha1 of the .qplib file it was parsed from. An entry is used
+# while the file keeps its size and mtime, or its sha1 when only the mtime
+# changed. Past cachesize bytes the least recently used entries are removed.
+
+cachepath = 'qplib_cache/'
+cachesize = 2**30
+cacheversion = 1
+
+_cache_arrays = ('b0', 'ccl', 'ccu', 'l', 'u', 'vtype', 'x0', 'y0', 'z0',
+                 'Q0_data', 'Q0_indices', 'Q0_indptr',
+                 'A0_data', 'A0_indices', 'A0_indptr',
+                 'Qc_cons', 'Qc_row', 'Qc_col', 'Qc_val')
+
+
+def _file_hash(filepath):
+    
+    sha1 = hashlib.sha1()
+    with open(filepath, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(2**20), b''):
+            sha1.update(chunk)
+    
+    return sha1.hexdigest()
+
+
+def _cache_load(nameproblem, filepath):
+    
+    # the cached QPLIBProblem of filepath, or None when there is no valid entry
+    
+    entry = os.path.join(cachepath, nameproblem)
+    metafile = os.path.join(entry, 'meta.json')
+    
+    try:
+        with open(metafile) as fp:
+            meta = json.load(fp)
+        stat = os.stat(filepath)
+    except (OSError, ValueError):
+        return None
+    
+    if meta['version'] != cacheversion or meta['size'] != stat.st_size:
+        return None
+    
+    # another process may replace or evict the entry meanwhile: the arrays
+    # already mapped stay valid, a missing one means no entry
+    arrays = {}
+    try:
+        if meta['mtime'] != stat.st_mtime_ns:
+            if meta['sha1'] != _file_hash(filepath):
+                return None
+            meta['mtime'] = stat.st_mtime_ns
+            with open(metafile, 'w') as fp:
+                json.dump(meta, fp)
+        
+        for key in _cache_arrays:
+            arrays[key] = np.load(os.path.join(entry, key + '.npy'), mmap_mode='r')
+        
+        # used now: last to be evicted
+        os.utime(metafile)
+    except (OSError, ValueError):
+        if len(arrays) < len(_cache_arrays):
+            return None
+    
+    n, m = meta['n'], meta['m']
+    
+    Q0 = sp.csr_matrix((arrays['Q0_data'], arrays['Q0_indices'], arrays['Q0_indptr']), shape=(n,n))
+    A0 = sp.csr_matrix((arrays['A0_data'], arrays['A0_indices'], arrays['A0_indptr']), shape=(m,n))
+    Qc = _quadratic_rows(arrays['Qc_cons'], arrays['Qc_row'], arrays['Qc_col'], arrays['Qc_val'], n)
+    
+    varnames = {int(k): v for k, v in meta['varnames'].items()}
+    connames = {int(k): v for k, v in meta['connames'].items()}
+    
+    return QPLIBProblem(meta['name'], meta['typee'], meta['sense'], n, m, Q0,
+                        arrays['b0'], meta['q0'], A0, arrays['ccl'], arrays['ccu'],
+                        Qc, meta['cinfmas'], arrays['l'], arrays['u'], arrays['vtype'],
+                        arrays['x0'], arrays['y0'], arrays['z0'], varnames, connames)
+
+
+def _cache_save(nameproblem, filepath, problem):
+    
+    # write the entry of problem next to the others and evict down to cachesize
+    
+    stat = os.stat(filepath)
+    
+    meta = {"version": cacheversion, "size": stat.st_size, "mtime": stat.st_mtime_ns,
+            "sha1": _file_hash(filepath), "name": problem.name, "typee": problem.typee,
+            "sense": problem.sense, "n": problem.n, "m": problem.m, "q0": problem.q0,
+            "cinfmas": problem.cinfmas, "varnames": problem.varnames, "connames": problem.connames}
+    
+    Qc = [(i, problem.Qc[i].tocoo()) for i in sorted(problem.Qc)]
+    
+    arrays = {"b0": problem.b0, "ccl": problem.ccl, "ccu": problem.ccu,
+              "l": problem.l, "u": problem.u, "vtype": problem.vtype,
+              "x0": problem.x0, "y0": problem.y0, "z0": problem.z0,
+              "Q0_data": problem.Q0.data, "Q0_indices": problem.Q0.indices, "Q0_indptr": problem.Q0.indptr,
+              "A0_data": problem.A0.data, "A0_indices": problem.A0.indices, "A0_indptr": problem.A0.indptr,
+              "Qc_cons": np.concatenate([np.full(Qi.nnz, i, dtype=np.int64) for i, Qi in Qc] + [np.zeros(0, dtype=np.int64)]),
+              "Qc_row": np.concatenate([Qi.row.astype(np.int64) for i, Qi in Qc] + [np.zeros(0, dtype=np.int64)]),
+              "Qc_col": np.concatenate([Qi.col.astype(np.int64) for i, Qi in Qc] + [np.zeros(0, dtype=np.int64)]),
+              "Qc_val": np.concatenate([Qi.data for i, Qi in Qc] + [np.zeros(0)])}
+    
+    # written aside and renamed into place, so a reader never sees half an entry
+    entry = os.path.join(cachepath, nameproblem)
+    partial = entry + '.%d.partial' % os.getpid()
+    
+    try:
+        os.makedirs(partial, exist_ok=True)
+        for key in _cache_arrays:
+            np.save(os.path.join(partial, key + '.npy'), np.ascontiguousarray(arrays[key]))
+        with open(os.path.join(partial, 'meta.json'), 'w') as fp:
+            json.dump(meta, fp)
+        
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(partial, entry)
+    except OSError as e:
+        print('Cache not written: ' + str(e))
+        shutil.rmtree(partial, ignore_errors=True)
+        return
+    
+    _cache_evict(nameproblem)
+
+
+def _cache_evict(keep=None):
+    
+    # remove the least recently used entries (meta.json mtime) until the
+    # cache fits in cachesize bytes; keep is never removed. Other workers
+    # write and evict at the same time: their entries being written
+    # (*.partial) are left alone, and an entry that goes away while it is
+    # looked at is skipped
+    
+    entries = []
+    for nameproblem in os.listdir(cachepath):
+        if nameproblem.endswith('.partial'):
+            continue
+        entry = os.path.join(cachepath, nameproblem)
+        try:
+            used = os.path.getmtime(os.path.join(entry, 'meta.json'))
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+        except OSError:
+            continue
+        entries.append((used, size, nameproblem))
+    
+    total = sum(size for used, size, nameproblem in entries)
+    
+    for used, size, nameproblem in sorted(entries):
+        if total <= cachesize:
+            break
+        if nameproblem == keep:
+            continue
+        shutil.rmtree(os.path.join(cachepath, nameproblem), ignore_errors=True)
+        total -= size
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+The solver-independent model of a formulation, and the result of a solve
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+######################
+#
+#  Models
+#
+# A formulation (build_QP, build_Glover_Woolsey, build_Glover, ...) writes
+# its model once, in matrix form, into a QPModel; a backend of backends
+# turns it into a solver model, solves it and returns the result
+# dictionary described in the package docstring, with x the values of the
+# first block of variables (None without a solution). solrelax depends on
+# relax: False (nan), "root" (the root relaxation of the MIP, read while it
+# is solved) or "lp" (the LP relaxation, solved after the MIP on a copy of
+# the model). The status is given in Gurobi codes (2 optimal, 3
+# infeasible, 5 unbounded, 9 time limit) for every backend.
+
+
+class QPModel(object):
+    
+    '''
+    Solver-independent model over the columns z of its variable blocks:
+    
+        min/max  c^t z + 1/2 x^t Q x + constant
+        
+        s.t.     rl <= A z <= ru
+                 rl_i <= 1/2 x^t Qc_i x + A_i x <= ru_i     (i in qrows)
+                 lb <= z <= ub,  z_j of type vtype_j ('C', 'I' or 'B')
+    
+    x are the first Q.shape[0] columns, and Q, Qc_i are lower triangles
+    read like the Q0 of readaQP. The lazy rows are part of the model too,
+    but a backend only adds them once a solution violates them.
+    '''
+    
+    def __init__(self, name, sense):
+        
+        self.name   = name              # problem name
+        self.sense  = sense             # minimize or maximize
+        self.blocks = []                # (block name, first column, size)
+        self.lb     = np.zeros(0)
+        self.ub     = np.zeros(0)
+        self.vtype  = np.zeros(0, dtype='<U1')
+        self.c      = np.zeros(0)
+        self.constant = 0.0
+        self.rows   = []                # (A, rl, ru), A over the columns at the time
+        self.lazy   = []                # the same, for the lazy rows
+        self.Q      = None              # quadratic objective over x
+        self.qrows  = {}                # i -> (Qc_i, A_i, rl_i, ru_i)
+        self.nonconvex = False          # Q or a quadratic row is nonconvex
+        self.start  = np.zeros(0)       # MIP start, nan where not given
+        self.fixed  = None              # x of the problem: nan where x is a column, else the value presolve fixed
+    
+    @property
+    def numcols(self):
+        return len(self.lb)
+    
+    @property
+    def numx(self):
+        # the variables of the problem, the first block
+        return self.blocks[0][2] if self.blocks else 0
+    
+    def addVars(self, name, size, lb=0.0, ub=np.inf, vtype='C', obj=0.0):
+        
+        # a new block of size columns, returned as their indices
+        first = self.numcols
+        self.blocks.append((name, first, size))
+        self.lb    = np.concatenate([self.lb, np.broadcast_to(lb, size)])
+        self.ub    = np.concatenate([self.ub, np.broadcast_to(ub, size)])
+        self.vtype = np.concatenate([self.vtype, np.broadcast_to(vtype, size)])
+        self.c     = np.concatenate([self.c, np.broadcast_to(obj, size)])
+        self.start = np.concatenate([self.start, np.full(size, np.nan)])
+        
+        return np.arange(first, first + size)
+    
+    def addRows(self, A, rl, ru, lazy=False):
+        
+        # rl <= A z <= ru, A over the columns added so far (or fewer)
+        A = sp.csr_matrix(A)
+        k = A.shape[0]
+        (self.lazy if lazy else self.rows).append((A, np.broadcast_to(rl, k).astype(float), np.broadcast_to(ru, k).astype(float)))
+    
+    def size(self):
+        
+        # (variables, rows, nonzeros) of the model, before the range
+        # columns a backend may add; the nonzeros of Q and of the quadratic
+        # rows count too
+        nnz = sum(Ai.nnz for Ai, rl, ru in self.rows)
+        if self.Q is not None:
+            nnz += self.Q.nnz
+        nnz += sum(Qi.nnz + Ai.nnz for Qi, Ai, rli, rui in self.qrows.values())
+        
+        return self.numcols, sum(Ai.shape[0] for Ai, rl, ru in self.rows) + len(self.qrows), nnz
+    
+    def matrix(self, lazy=False):
+        
+        # all linear rows (the lazy ones with lazy) as one CSR over every column
+        rows = self.lazy if lazy else self.rows
+        if not rows:
+            return sp.csr_matrix((0, self.numcols)), np.zeros(0), np.zeros(0)
+        
+        A = sp.vstack([sp.csr_matrix((Ai.data, Ai.indices, Ai.indptr), shape=(Ai.shape[0], self.numcols)) for Ai, rl, ru in rows]).tocsr()
+        rl = np.concatenate([rl for Ai, rl, ru in rows])
+        ru = np.concatenate([ru for Ai, rl, ru in rows])
+        
+        return A, rl, ru
+
+
+def _violated(A, rl, ru, z, tol=1e-6, most=1000):
+    
+    # the rows of rl <= A z <= ru that z violates, by decreasing violation,
+    # the most violated first (most of them, a round of separation)
+    act = A @ z
+    violation = np.maximum(rl - act, act - ru)
+    rows = np.flatnonzero(violation > tol)
+    
+    return rows[np.argsort(-violation[rows], kind='stable')][:most]
+
+
+def _failed_result(nameproblem):
+    
+    # the result of a job that did not finish
+    return {"name": nameproblem,"timeload": np.nan,"timerun": np.nan,"gapmip": np.nan,"solobj": np.nan,"solBound": np.nan,"status": np.nan,"solrelax": np.nan,"x": None,
+            "timeparse": np.nan,"timepresolve": np.nan,"timebuild": np.nan,"numvars": np.nan,"numrows": np.nan,"numnz": np.nan,"trajectory": []}
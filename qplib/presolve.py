@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Presolve and decomposition of the binary problems
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+######################
+#
+#  Presolve
+#
+# presolve_QBL reduces a problem with binary variables before it is
+# linearized: the objective is written with a strictly lower triangular
+# Q0 (the diagonal is folded into b0, x_i^2 = x_i), variables are fixed by
+# first-order persistency, and the rows left without variables or without
+# a finite side are dropped. _unfix maps a solution of the reduced problem
+# back, and split_QBL splits a problem into its independent blocks.
+
+
+def _binary_objective(Q0, b0):
+    
+    # 1/2 x^t Q0 x + b0^t x over x in {0,1}^n as 1/2 x^t L x + b^t x, with
+    # L strictly lower triangular and the diagonal in b (x_i^2 = x_i)
+    Q0 = sp.csr_matrix(Q0)
+    b = np.asarray(b0, dtype=float) + 0.5*Q0.diagonal()
+    L = (sp.tril(Q0, -1) + sp.triu(Q0, 1).transpose()).tocsr()
+    L.sum_duplicates()
+    L.eliminate_zeros()
+    
+    return L, b
+
+
+def presolve_QBL(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu):
+    
+    '''
+    Returns the reduced problem, a tuple as the one of readaQP with the same
+    optimal value, and fixed: the value of every variable of the problem
+    fixed by the presolve, nan for the variables kept (the variables of the
+    reduced problem, in order).
+    
+    x_i is fixed to 0 when the objective cannot get better with x_i = 1,
+    whatever the other variables, and lowering x_i cannot break a row (x_i
+    only has positive coefficients in rows without a lower side, negative
+    ones in rows without an upper side); likewise for x_i = 1. Fixing
+    repeats until no variable is fixed.
+    '''
+    
+    # 1/2 x^t L x with L strictly lower triangular, the diagonal in b
+    L, b = _binary_objective(Q0, b0)
+    S = (L + L.transpose()).tocsr()
+    
+    # the objective changes by b_i + 1/2 sum_j S[i,j] x_j when x_i goes
+    # from 0 to 1, between bmenos_i and bmas_i over the free x_j
+    Smas = S.maximum(0)
+    Smenos = S.minimum(0)
+    
+    # the variables that can go down (to 0) or up (to 1) without breaking a row
+    A0 = sp.csr_matrix(A0)
+    lower = np.isfinite(ccl).astype(float)
+    upper = np.isfinite(ccu).astype(float)
+    Amas = A0.maximum(0).transpose()
+    Amenos = -A0.minimum(0).transpose()
+    down = (Amas @ lower + Amenos @ upper) == 0
+    up = (Amas @ upper + Amenos @ lower) == 0
+    
+    fixed = np.full(n, np.nan)
+    while True:
+        free = np.isnan(fixed)
+        ones = (fixed == 1).astype(float)
+        gain = b + 0.5*(S @ ones)
+        bmas = gain + 0.5*(Smas @ free.astype(float))
+        bmenos = gain + 0.5*(Smenos @ free.astype(float))
+        
+        if 'minimize' == sense[0][0]:
+            zero = free & down & (bmenos >= 0)
+            one = free & up & (bmas <= 0) & ~zero
+        else:
+            zero = free & down & (bmas <= 0)
+            one = free & up & (bmenos >= 0) & ~zero
+        
+        if not (zero.any() or one.any()):
+            break
+        fixed[zero] = 0.0
+        fixed[one] = 1.0
+    
+    # the reduced problem over the free variables
+    keep = np.flatnonzero(free)
+    q = q0 + b @ ones + 0.5*(ones @ (L @ ones))
+    A = A0[:, keep]
+    rl = ccl - A0 @ ones
+    ru = ccu - A0 @ ones
+    
+    # rows without a finite side or without variables (when they hold)
+    empty = np.diff(A.indptr) == 0
+    rows = np.flatnonzero((np.isfinite(rl) | np.isfinite(ru)) & ~(empty & (rl <= 1e-9) & (ru >= -1e-9)))
+    
+    reduced = (name,typee,sense,len(keep),len(rows),L[keep][:,keep],gain[keep],q,A[rows],rl[rows],ru[rows])
+    
+    return reduced, fixed
+
+
+def _unfix(x, fixed):
+    
+    # a solution of the presolved problem on the variables of the problem
+    if x is None:
+        return None
+    full = fixed.copy()
+    full[np.isnan(fixed)] = np.round(x)
+    
+    return full
+
+
+def split_QBL(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu):
+    
+    '''
+    Returns the independent blocks of the problem, a list of (problem,
+    columns) from the largest block: the problem of each block over the
+    variables columns of the problem, with q0 in the first block only.
+    
+    The blocks are the connected components of the graph of the variables
+    and the rows, with an edge between two variables for every nonzero of
+    Q0 and between a row and a variable for every nonzero of A0. A row
+    without variables belongs to no block; when one does not hold, the
+    problem is kept whole, so that the solver reports it infeasible.
+    '''
+    from scipy.sparse.csgraph import connected_components
+    
+    Q0 = sp.csr_matrix(Q0)
+    A0 = sp.csr_matrix(A0)
+    empty = np.diff(A0.indptr) == 0
+    if n == 0 or np.any(empty & ((ccl > 1e-9) | (ccu < -1e-9))):
+        return [((name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu), np.arange(n))]
+    
+    # variables 0..n-1, then rows n..n+m-1
+    Q = (abs(Q0) + abs(Q0).transpose()).tocsr()
+    B = abs(A0)
+    graph = sp.bmat([[Q, B.transpose()], [B, None]], format='csr')
+    count, labels = connected_components(graph, directed=False)
+    
+    sizes = np.bincount(labels[:n], minlength=count)
+    blocks = []
+    for k, label in enumerate(c for c in np.argsort(-sizes, kind='stable') if sizes[c] > 0):
+        columns = np.flatnonzero(labels[:n] == label)
+        rows = np.flatnonzero((labels[n:] == label) & ~empty)
+        problem = ([name[0] + '/' + str(k)],typee,sense,len(columns),len(rows),Q0[columns][:,columns],b0[columns],q0 if k == 0 else 0.0,
+                   A0[rows][:,columns],ccl[rows],ccu[rows])
+        blocks.append((problem, columns))
+    
+    return blocks
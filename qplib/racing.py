@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Races of several methods on one instance
+"""
+
+import os
+import numpy as np
+
+from qplib.instances import readaQP
+from qplib.model import _failed_result
+from qplib.runner import run_job
+
+
+######################
+#
+#  Racing
+#
+# run_race solves one instance with several methods (and backends) at
+# once, a process each. The racers share their best solution: a Gurobi
+# racer publishes every incumbent it finds and takes a better one found by
+# another racer as a solution of its own, completed by Gurobi on its y or
+# w (see the callback of the gurobi backend). The race ends as soon as a
+# racer proves optimality, on its own or with its bound on the shared
+# incumbent: the Gurobi racers stop at their next callback and the others
+# (HiGHS, without callbacks through scipy) are terminated.
+
+
+_race = None        # in a racer: (incumbent, x, done) shared with the others
+
+
+def _racer(state, results, k, nameproblem, method, backend, threads, timelimit, seed):
+    
+    # racer k, in its process
+    global _race
+    _race = state
+    try:
+        result = run_job(nameproblem, method, backend, threads, timelimit, None, seed)
+    except Exception as e:
+        print('Error in ' + str((nameproblem, method)) + ': ' + str(e))
+        result = _failed_result(nameproblem)
+    results.put((k, result))
+
+
+def run_race(nameproblem, racers=(("GW", "gurobi"), ("G", "gurobi")), threads=None, timelimit=600, seed=None, grace=5.0):
+    
+    '''
+    Solve nameproblem with every (method, backend) of racers at once, each
+    racer with timelimit and threads threads (the cores shared by default),
+    until one proves optimality: the wall-clock time of the race is the one
+    of its fastest racer, not their sum. The racers still running get
+    grace seconds to return what they found before they are terminated.
+    
+    Returns the best result of the racers, with the best bound of all of
+    them (status 2 when it closes the gap), timerun the wall-clock time of
+    the race and racers the result of every racer, (method, backend) ->
+    result (nan for the ones terminated).
+    '''
+    import multiprocessing as mp
+    import queue
+    import time
+    
+    racers = [tuple(racer) for racer in racers]
+    if threads is None:
+        threads = max(1, (os.cpu_count() or 1) // len(racers))
+    problem = readaQP(nameproblem)
+    sign = 1.0 if problem.sense[:3] == 'min' else -1.0
+    
+    state = (mp.Value('d', np.inf), mp.Array('d', problem.n, lock=False), mp.Event())
+    results = mp.Queue()
+    processes = [mp.Process(target=_racer, args=(state, results, k, nameproblem, method, backend, threads, timelimit, seed))
+                 for k, (method, backend) in enumerate(racers)]
+    
+    start_time = time.time()
+    for process in processes:
+        process.start()
+    
+    # the results as they come, until all are in, the racers died, or the
+    # grace after the race was won is over
+    finished = {}
+    deadline = None
+    while len(finished) < len(processes):
+        try:
+            k, result = results.get(timeout=0.1)
+            finished[k] = result
+            if result["status"] == 2:
+                state[2].set()
+        except queue.Empty:
+            if not any(process.is_alive() for k, process in enumerate(processes) if k not in finished):
+                break
+        if state[2].is_set() and deadline is None:
+            deadline = time.time() + grace
+        if deadline is not None and time.time() > deadline:
+            break
+    runtime = time.time() - start_time
+    
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    
+    # the best solution and the best bound of the racers
+    race = _failed_result(nameproblem)
+    solved = [result for result in finished.values() if result.get("x") is not None and np.isfinite(result["solobj"])]
+    if solved:
+        race.update(min(solved, key=lambda result: sign*result["solobj"]))
+    if state[0].value < np.inf and (not solved or state[0].value < sign*race["solobj"]):
+        race["solobj"], race["x"] = sign*state[0].value, np.array(state[1][:])
+    bounds = [sign*result["solBound"] for result in finished.values() if np.isfinite(result["solBound"])]
+    if bounds:
+        race["solBound"] = sign*max(bounds)
+    if np.isfinite(race["solobj"]) and np.isfinite(race["solBound"]):
+        race["gapmip"] = abs(race["solobj"] - race["solBound"])/max(abs(race["solobj"]), 1e-10)
+        if race["gapmip"] <= 1e-4:
+            race["status"] = 2
+    race["timerun"] = runtime
+    race["racers"] = dict((racer, finished.get(k, _failed_result(nameproblem))) for k, racer in enumerate(racers))
+    
+    return race
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Jobs, and batches of them on a pool of worker processes
+"""
+
+import os
+import numpy as np
+
+from qplib.formulations import (formulations, solve_QP_gurobi, solve_Glover_Woolsey_gurobi, solve_Glover_gurobi,
+                                solve_RLT_gurobi, solve_QCR_gurobi, solve_decomposed)
+from qplib.heuristics import solve_tabu
+from qplib.instances import readaQP
+from qplib.model import _failed_result
+
+
+######################
+#
+#  Batch runs
+#
+# A job is a pair (instance name, method) with method a key of methods.
+# run_batch spreads the jobs over a pool of processes and yields every
+# (job, result) as soon as it finishes.
+
+
+methods = {"QP": solve_QP_gurobi, "GW": solve_Glover_Woolsey_gurobi, "G": solve_Glover_gurobi,
+           "RLT": solve_RLT_gurobi, "QCR": solve_QCR_gurobi, "TS": solve_tabu}
+
+
+# the methods a backend cannot solve: HiGHS solves linear models only
+unsupported = {"gurobi": set(), "highs": {"QP", "QCR"}}
+
+
+def jobs_for(nameproblem, linearizations=("GW", "G"), backend=None):
+    
+    # the methods the scripts run on an instance: the QP itself when the
+    # linearizations do not apply, the formulations linearizations
+    # (keys of methods, "QP" for the direct MIQP as a baseline) otherwise
+    # (nothing for a linear objective); with backend, only the methods
+    # it can solve
+    problem = readaQP(nameproblem)
+    
+    if not problem.linearizable():
+        jobs = [(nameproblem, "QP")]
+    elif problem.Q0.count_nonzero() > 0:
+        jobs = [(nameproblem, method) for method in linearizations]
+    else:
+        jobs = []
+    
+    return [job for job in jobs if backend is None or job[1] not in unsupported[backend]]
+
+
+def run_job(nameproblem, method, backend="gurobi", threads=None, timelimit=None, start=None, seed=None, decompose=False):
+    
+    # one job, in a worker: read the instance (from the cache after the
+    # first read) and solve it from start, or from the starting point of
+    # the file when it gives one; no .lp file, the workers would overwrite it.
+    # With decompose, a formulation solves the blocks of the instance one
+    # after the other
+    import time
+    
+    start_time = time.time()
+    problem = readaQP(nameproblem)
+    timeparse = time.time() - start_time
+    name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu = problem
+    
+    if start is None and np.any(problem.x0):
+        start = problem.x0
+    
+    options = {"backend": backend, "threads": threads, "lpfile": None, "start": start}
+    if timelimit is not None:
+        options["timelimit"] = timelimit
+    if seed is not None:
+        options["seed"] = seed
+    if method == "QP":
+        options.update(l=problem.l, u=problem.u, vtype=problem.vtype, Qc=problem.Qc)
+    
+    if decompose and method in formulations:
+        result = solve_decomposed(method,name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,workers=1,**options)
+    else:
+        result = methods[method](name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,**options)
+    result["timeparse"] = timeparse
+    
+    return result
+
+
+def _keep_best(best, nameproblem, result):
+    
+    # best[nameproblem] becomes the solution of result when it is better
+    sign = 1.0 if readaQP(nameproblem).sense[:3] == 'min' else -1.0
+    if nameproblem not in best or sign*result["solobj"] < sign*best[nameproblem][0]:
+        best[nameproblem] = (result["solobj"], result["x"])
+
+
+def run_batch(jobs, workers=None, threads=None, backend="gurobi", timelimit=None, retries=2, reuse=True, seed=None, best=None, decompose=False):
+    
+    '''
+    Solve the jobs on a pool of workers processes, each solver using threads
+    threads; by default workers * threads is the number of cores (one thread
+    per worker if neither is given). Yields (job, result) in the order the
+    jobs finish.
+    
+    A worker that dies (a solver crash, out of memory) breaks the pool: it
+    is started again and the jobs that were running are solved again one
+    at a time, so that a crash is charged to the job that caused it. A job
+    that crashes on its own more than retries times is given a result of
+    nan, as is at once a job that raises an exception.
+    
+    With reuse, a job starts from the best solution found so far for its
+    instance by the jobs that finished before it was submitted; that
+    depends on the order the jobs finish, so a reproducible run (a
+    benchmark) goes without it. best gives the solutions to start from
+    before any job finishes, instance -> (objective, x). seed is the
+    solvers' random seed, and timelimit may be a function of the job,
+    called when the job is submitted. With decompose, the formulations
+    solve the independent blocks of an instance one after the other
+    (solve_decomposed).
+    '''
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    from concurrent.futures.process import BrokenProcessPool
+    
+    cores = os.cpu_count() or 1
+    if workers is None:
+        workers = max(1, cores // (threads or 1))
+    if threads is None:
+        threads = max(1, cores // workers)
+    
+    pending = [tuple(job) for job in jobs]
+    suspects = []                   # jobs that were running when a worker died
+    attempts = dict((job, 0) for job in pending)
+    best = dict(best or {})         # instance -> (objective, x) of its best solution
+    
+    while pending or suspects:
+        
+        # the suspects run alone, in a pool of their own
+        if suspects:
+            queue, width = [suspects.pop(0)], 1
+        else:
+            queue, width = pending, workers
+        
+        crashed = []
+        with ProcessPoolExecutor(max_workers=min(width, len(queue))) as pool:
+            
+            # at most width jobs are submitted, so a crash only takes
+            # down the jobs that were running
+            running = {}
+            while queue or running:
+                
+                while queue and len(running) < width and not crashed:
+                    job = queue.pop(0)
+                    start = best[job[0]][1] if job[0] in best else None
+                    limit = timelimit(job) if callable(timelimit) else timelimit
+                    running[pool.submit(run_job, job[0], job[1], backend, threads, limit, start, seed, decompose)] = job
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        crashed.append(job)
+                        continue
+                    except Exception as e:
+                        print('Error in ' + str(job) + ': ' + str(e))
+                        result = _failed_result(job[0])
+                    if reuse and result.get("x") is not None and np.isfinite(result["solobj"]):
+                        _keep_best(best, job[0], result)
+                    yield job, result
+        
+        for job in crashed:
+            if width > 1:
+                suspects.append(job)
+                continue
+            attempts[job] += 1
+            if attempts[job] > retries:
+                print('Error in ' + str(job) + ': the worker died')
+                yield job, _failed_result(job[0])
+            else:
+                suspects.append(job)
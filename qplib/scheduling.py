@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Campaigns of jobs within a wall-clock time, by predicted difficulty
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from qplib.instances import readaQP
+from qplib.runner import run_batch, _keep_best
+
+
+######################
+#
+#  Scheduling
+#
+# run_campaign solves a set of jobs within a wall-clock time on a pool of
+# workers. The jobs go longest predicted first, so that the long ones do
+# not end up alone at the end, and each gets its time limit when it
+# starts: its share, by predicted time, of the budget walltime * workers
+# not yet given out. A job that finishes early gives the rest of its
+# limit back to the budget, and the jobs stopped by their limit are run
+# once more from their incumbent with what is left.
+
+
+_difficulty_features = ('nbinvars', 'ncons', 'objquaddensity', 'nobjquadnz')
+
+
+def past_times(results, method):
+    
+    # the time (load and run) of the solved (2) and timed out (9) jobs of
+    # method in the store results, any params; a timed out job gives a
+    # lower bound of its time
+    return pd.read_sql_query('SELECT name, timeload + timerun AS time FROM results WHERE method = ? AND status IN (2, 9) AND timerun IS NOT NULL',
+                             results, params=(method,))
+
+
+def predict_times(datos, history=None):
+    
+    '''
+    The predicted solve time of every instance of datos (rows of
+    instancedata.csv), a Series by name. With history (name, time) of
+    enough instances of datos, log(time) is fitted by least squares on the
+    log(1 + feature) of _difficulty_features; otherwise the time grows
+    with the size of the linearization, nobjquadnz + nbinvars + ncons.
+    '''
+    features = np.log1p(datos[list(_difficulty_features)].fillna(0).to_numpy(dtype=float))
+    X = np.column_stack([np.ones(len(datos)), features])
+    prior = pd.Series(1e-2*(datos['nobjquadnz'] + datos['nbinvars'] + datos['ncons']).fillna(0).to_numpy(dtype=float) + 1e-3,
+                      index=datos['name'].to_numpy())
+    
+    if history is None or len(history) == 0:
+        return prior
+    
+    # the mean log time of every instance of the history
+    history = history[history['time'] > 0]
+    logtime = np.log(history['time'].astype(float)).groupby(history['name']).mean()
+    rows = np.flatnonzero(datos['name'].isin(logtime.index).to_numpy())
+    if len(rows) < X.shape[1] + 2:
+        return prior
+    
+    # ridge, for the features that do not change over the history
+    Xh, yh = X[rows], logtime[datos['name'].to_numpy()[rows]].to_numpy()
+    coef = np.linalg.solve(Xh.T @ Xh + 1e-3*np.eye(X.shape[1]), Xh.T @ yh)
+    
+    return pd.Series(np.exp(X @ coef), index=datos['name'].to_numpy())
+
+
+def _merge_results(first, second, sense):
+    
+    # the result of a job solved again (second) from where first stopped:
+    # the best solution and bound of both, the times of both
+    sign = 1.0 if sense[:3] == 'min' else -1.0
+    result = dict(second)
+    
+    objs = [r["solobj"] for r in (first, second)]
+    if np.isnan(objs[1]) or (not np.isnan(objs[0]) and sign*objs[0] < sign*objs[1]):
+        result["solobj"], result["x"] = first["solobj"], first["x"]
+    bounds = [r["solBound"] for r in (first, second) if not np.isnan(r["solBound"])]
+    if bounds:
+        result["solBound"] = sign*max(sign*b for b in bounds)
+    if not np.isnan(result["solobj"]) and not np.isnan(result["solBound"]):
+        result["gapmip"] = abs(result["solobj"] - result["solBound"])/max(abs(result["solobj"]), 1e-10)
+    
+    result["solrelax"] = first["solrelax"]
+    for key in ("timeload", "timerun", "timeparse", "timepresolve", "timebuild"):
+        result[key] = np.nansum([first.get(key, np.nan), second.get(key, np.nan)])
+    offset = first["timerun"] if np.isfinite(first["timerun"]) else 0.0
+    result["trajectory"] = list(first.get("trajectory", [])) + [(t + offset, obj, bound) for t, obj, bound in second.get("trajectory", [])]
+    
+    return result
+
+
+def run_campaign(jobs, walltime, workers=None, threads=None, backend="gurobi", datos=None, results=None, retry=True, minlimit=5.0):
+    
+    '''
+    Solve the jobs (nameproblem, method) in about walltime seconds on a
+    pool of workers processes (as run_batch), and yield (job, result) as
+    they finish; a job run twice is yielded once, with both runs merged.
+    
+    The times are predicted by predict_times from the features of datos
+    (instancedata.csv by default) and, with the results store results,
+    the past times of each method. A job never gets less than minlimit
+    seconds, nor more than what is left of walltime.
+    '''
+    import time
+    
+    cores = os.cpu_count() or 1
+    if workers is None:
+        workers = max(1, cores // (threads or 1))
+    if datos is None:
+        datos = pd.read_csv('instancedata.csv')
+    
+    jobs = [tuple(job) for job in jobs]
+    predicted = {}
+    for method in set(job[1] for job in jobs):
+        times = predict_times(datos, None if results is None else past_times(results, method))
+        default = float(times.median()) if len(times) else 1.0
+        for job in jobs:
+            if job[1] == method:
+                predicted[job] = float(times.get(job[0], default))
+    
+    deadline = time.time() + walltime
+    budget = {"left": float(walltime*workers), "running": {}, "waiting": 0.0}
+    
+    def timelimit(job):
+        # the share of the budget of job, when it is submitted
+        if job in budget["running"]:
+            settle(job, 0.0)
+        budget["waiting"] = max(budget["waiting"] - predicted[job], 0.0)
+        share = budget["left"]*predicted[job]/(predicted[job] + budget["waiting"])
+        limit = max(minlimit, min(share, deadline - time.time()))
+        budget["left"] -= limit
+        budget["running"][job] = (time.time(), limit)
+        return limit
+    
+    def settle(job, used):
+        # what job did not use of its limit goes back to the budget
+        start, limit = budget["running"].pop(job)
+        used = max(used if np.isfinite(used) else 0.0, time.time() - start)
+        budget["left"] += max(limit - used, 0.0)
+    
+    def run(batch, best=None):
+        batch.sort(key=lambda job: -predicted[job])
+        budget["waiting"] = sum(predicted[job] for job in batch)
+        for job, result in run_batch(batch, workers=workers, threads=threads, backend=backend, timelimit=timelimit, best=best):
+            if job in budget["running"]:
+                settle(job, result["timeload"] + result["timerun"])
+            yield job, result
+    
+    # longest predicted first; the jobs stopped by their limit wait
+    stopped = {}
+    for job, result in run(list(jobs)):
+        if retry and result["status"] == 9:
+            stopped[job] = result
+        else:
+            yield job, result
+    
+    # once more, from their incumbent, with the budget left
+    best = {}
+    for job, result in stopped.items():
+        if result.get("x") is not None and np.isfinite(result["solobj"]):
+            _keep_best(best, job[0], result)
+    if stopped and deadline - time.time() >= minlimit:
+        for job, result in run(list(stopped), best):
+            yield job, _merge_results(stopped.pop(job), result, readaQP(job[0]).sense)
+    for job, result in stopped.items():
+        yield job, result
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+The results store
+"""
+
+import numpy as np
+import json
+import sqlite3
+
+
+######################
+#
+#  Results
+#
+# resultspath is a SQLite database with one row per (instance, method,
+# params), params the JSON of the options that change a result (backend,
+# time limit). A row is written as soon as its job finishes, so an
+# interrupted sweep keeps what it solved, and results_done tells a new
+# run which jobs to skip. Jobs without a status (a failure) are not done.
+# Next to the result, the row keeps the telemetry of the job (the time of
+# each phase and the size of the model), and the table trajectories its
+# (time, incumbent, bound) samples. The read functions give pandas
+# DataFrames, and import pandas when called: qplib-run only writes.
+
+resultspath = 'results.sqlite'
+
+_result_columns = ('name', 'timeload', 'timerun', 'gapmip', 'solobj', 'solBound', 'status', 'solrelax')
+
+_telemetry_columns = ('timeparse', 'timepresolve', 'timebuild', 'numvars', 'numrows', 'numnz')
+
+
+def open_results(path=None):
+    
+    # the store at path (resultspath by default), created on first use; a
+    # store written before the telemetry gets its columns
+    con = sqlite3.connect(resultspath if path is None else path)
+    con.execute('PRAGMA journal_mode=WAL')
+    con.execute('CREATE TABLE IF NOT EXISTS results (name TEXT, method TEXT, params TEXT, '
+                + ', '.join(key + ' REAL' for key in _result_columns[1:])
+                + ', PRIMARY KEY (name, method, params))')
+    columns = [row[1] for row in con.execute('PRAGMA table_info(results)')]
+    for key in _telemetry_columns:
+        if key not in columns:
+            con.execute('ALTER TABLE results ADD COLUMN ' + key + ' REAL')
+    con.execute('CREATE TABLE IF NOT EXISTS trajectories (name TEXT, method TEXT, params TEXT, '
+                'time REAL, incumbent REAL, bound REAL)')
+    con.execute('CREATE INDEX IF NOT EXISTS trajectories_job ON trajectories (name, method, params)')
+    con.commit()
+    
+    return con
+
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def add_result(con, job, params, result):
+    
+    # the result of job (name, method) run with params; a new run of the
+    # same job replaces it
+    nameproblem, method = job
+    keys = _result_columns[1:] + _telemetry_columns
+    values = [float(result.get(key, np.nan)) for key in keys]
+    con.execute('INSERT OR REPLACE INTO results (name, method, params, ' + ', '.join(keys) + ') VALUES (?, ?, ?, ' + ', '.join('?'*len(values)) + ')',
+                [nameproblem, method, _params_key(params)] + [None if np.isnan(v) else v for v in values])
+    
+    con.execute('DELETE FROM trajectories WHERE name = ? AND method = ? AND params = ?', (nameproblem, method, _params_key(params)))
+    con.executemany('INSERT INTO trajectories VALUES (?, ?, ?, ?, ?, ?)',
+                    [(nameproblem, method, _params_key(params)) + tuple(None if np.isnan(v) else float(v) for v in sample)
+                     for sample in result.get("trajectory", [])])
+    con.commit()
+
+
+def results_done(con, params):
+    
+    # the jobs (name, method) with a status for params
+    rows = con.execute('SELECT name, method FROM results WHERE params = ? AND status IS NOT NULL', (_params_key(params),))
+    
+    return set(rows)
+
+
+def read_results(con, method, params):
+    import pandas as pd
+    
+    # the results of method with params, as the tables of the scripts
+    return pd.read_sql_query('SELECT ' + ', '.join(_result_columns) + ' FROM results WHERE method = ? AND params = ? ORDER BY rowid',
+                             con, params=(method, _params_key(params)))
+
+
+def read_telemetry(con, method, params):
+    import pandas as pd
+    
+    # the phase times and model sizes of method with params, with the
+    # solve time timerun
+    data = pd.read_sql_query('SELECT name, ' + ', '.join(_telemetry_columns) + ', timerun FROM results WHERE method = ? AND params = ? ORDER BY rowid',
+                             con, params=(method, _params_key(params)))
+    
+    # NULL (nan) columns come back as objects
+    return data.astype({key: float for key in _telemetry_columns + ('timerun',)})
+
+
+def read_trajectories(con, method, params):
+    import pandas as pd
+    
+    # the (time, incumbent, bound) samples of method with params, one row
+    # per sample, in time order for every instance
+    data = pd.read_sql_query('SELECT name, time, incumbent, bound FROM trajectories WHERE method = ? AND params = ? ORDER BY name, time, rowid',
+                             con, params=(method, _params_key(params)))
+    
+    return data.astype({'time': float, 'incumbent': float, 'bound': float})
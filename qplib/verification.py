@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of solutions outside the solvers
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from qplib.instances import readaQP
+
+
+######################
+#
+#  Verification
+#
+# evaluate_solutions recomputes the objective and the feasibility of many
+# points at once, outside any solver: one sparse product with Q0 and one
+# with A0 for the whole matrix of points, so that a solution pool or a
+# population of a heuristic is checked in milliseconds. verify_solution
+# checks the result of a solve against its own objective and against
+# solobjvalue of instancedata.csv.
+
+
+def evaluate_solutions(problem, X, tol=1e-6):
+    
+    '''
+    Evaluate the points X (k x n, a point per row, or a single point) on
+    problem, a QPLIBProblem or the tuple name,...,ccu of a binary problem.
+    1/2 x^t Q0 x is taken over Q0 as readaQP keeps it (see readaQP), and
+    the quadratic rows, bounds and types of a QPLIBProblem are checked too.
+    
+    Returns a DataFrame with a row per point: objective, rowviolation (the
+    largest violation of a row), boundviolation (of l <= x <= u),
+    integrality (the largest distance to an integer of the integer and
+    binary variables) and feasible (the three at most tol).
+    '''
+    name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu = problem
+    l = getattr(problem, 'l', np.zeros(n))
+    u = getattr(problem, 'u', np.ones(n))
+    vtype = getattr(problem, 'vtype', np.full(n, 'B'))
+    Qc = getattr(problem, 'Qc', None) or {}
+    
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    
+    # x^t Q x of every point: the rows of X times the rows of (Q X^t)^t
+    objective = 0.5*np.sum(X*(sp.csr_matrix(Q0) @ X.T).T, axis=1) + X @ b0 + q0
+    
+    act = (sp.csr_matrix(A0) @ X.T).T if m > 0 else np.zeros((len(X), 0))
+    for i, Qi in Qc.items():
+        act[:, i] += 0.5*np.sum(X*(Qi @ X.T).T, axis=1)
+    rowviolation = np.max(np.maximum(ccl - act, act - ccu), axis=1, initial=0.0)
+    boundviolation = np.max(np.maximum(l - X, X - u), axis=1, initial=0.0)
+    integer = vtype != 'C'
+    integrality = np.max(np.abs(X[:, integer] - np.round(X[:, integer])), axis=1, initial=0.0)
+    
+    return pd.DataFrame({"objective": objective, "rowviolation": rowviolation, "boundviolation": boundviolation, "integrality": integrality,
+                         "feasible": (rowviolation <= tol) & (boundviolation <= tol) & (integrality <= tol)})
+
+
+def verify_solution(nameproblem, result, datos=None, tol=1e-6, gaptol=1e-4):
+    
+    '''
+    Check the solution x of result, a result of a solve of nameproblem: it
+    must be feasible (evaluate_solutions), give the objective solobj, and
+    be no better than solobjvalue of datos (instancedata.csv by default),
+    or equal to it (within gaptol, relative) with status 2.
+    
+    Returns a dict: objective (nan without x), feasible, consistent (with
+    solobj), known (solobjvalue, nan when unknown), agrees (with known)
+    and ok, all of them.
+    '''
+    if datos is None:
+        datos = pd.read_csv('instancedata.csv')
+    problem = readaQP(nameproblem)
+    sign = 1.0 if problem.sense[:3] == 'min' else -1.0
+    
+    known = datos.loc[datos['name'] == nameproblem, 'solobjvalue']
+    known = float(known.iloc[0]) if len(known) else np.nan
+    check = {"objective": np.nan, "feasible": False, "consistent": False, "known": known, "agrees": False, "ok": False}
+    if result.get("x") is None:
+        return check
+    
+    evaluation = evaluate_solutions(problem, result["x"], tol).iloc[0]
+    objective = float(evaluation["objective"])
+    scale = max(abs(objective), 1.0)
+    check["objective"] = objective
+    check["feasible"] = bool(evaluation["feasible"])
+    check["consistent"] = bool(abs(objective - result["solobj"]) <= gaptol*scale)
+    if np.isnan(known):
+        check["agrees"] = True
+    elif result["status"] == 2:
+        check["agrees"] = bool(abs(objective - known) <= gaptol*scale)
+    else:
+        check["agrees"] = bool(sign*objective >= sign*known - gaptol*scale)
+    check["ok"] = check["feasible"] and check["consistent"] and check["agrees"]
+    
+    return check
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+The first study: the QP and both linearizations of 20 instances, 600 s
+each, exported to export_dataframe_<method>.csv. Run from the directory
+of qplib/ and instancedata.csv, with the package installed:
+
+    python scripts/study_linearizations.py
+"""
+
+import pandas as pd
+
+from qplib.backends import _has_gurobi
+from qplib.runner import jobs_for, run_batch
+from qplib.store import open_results, add_result, results_done, read_results
+from qplib.verification import verify_solution
+
+
+if __name__ == '__main__':
+    
+    # Gurobi when it is installed, HiGHS (linearizations only) otherwise
+    backend = "gurobi" if _has_gurobi() else "highs"
+    params = {"backend": backend}
+    
+    # the results solved so far, kept across runs
+    results = open_results()
+    datos = pd.read_csv('instancedata.csv')
+    
+    datos_select = ["QPLIB_3834","QPLIB_0633","QPLIB_0067","QPLIB_3762","QPLIB_2512",
+    "QPLIB_3714","QPLIB_10040","QPLIB_3402","QPLIB_10043",
+    "QPLIB_10054","QPLIB_3775","QPLIB_3883","QPLIB_3803",
+    "QPLIB_3815","QPLIB_2492","QPLIB_10057","QPLIB_3614",
+    "QPLIB_7144","QPLIB_3703","QPLIB_2357"]
+    
+    # the QP or both linearizations, with the QP as a baseline, of every
+    # instance, on all the cores, but the ones a previous run already solved
+    done = results_done(results, params)
+    linearizations = ("GW", "G", "QP") if backend == "gurobi" else ("GW", "G")
+    jobs = [job for nameproblem in datos_select for job in jobs_for(nameproblem, linearizations, backend) if job not in done]
+    
+    for job, result in run_batch(jobs, backend=backend):
+        
+        print(job[0], job[1])
+        print("")
+        check = verify_solution(job[0], result, datos)
+        if result["x"] is not None and not check["ok"]:
+            print('Warning: the solution of ' + str(job) + ' does not verify: ' + str(check))
+        add_result(results, job, params, result)
+    
+    for method in ("QP", "GW", "G"):
+        data = read_results(results, method, params)
+        data = data[data['name'].isin(datos_select)]
+        data.to_csv ('export_dataframe_' + method + '.csv', index = False, header=True)
+
+'''
+Analyse the instances describing their main features, with particular attention  
+to the presence of binary variables and the diferent kind of linear constraints:
+    
+    resp: 
+        - There are 91 problem type QBL, that is, they have quadratic function,
+          linear constraints and binary variables.
+        - The range of binary variables is from 50 to 8904.
+        - 80% of the binary variables vary between 50 and 900.
+        - 6 problems are maximization the rest is minimization
+        
+Analyse and compare the quality of the bound provided by the Linear Programming 
+relaxation of the two Linearization Techniques.
+
+    assumptions: We select 20 minimization problems in increasing order in the number of binary variables.
+                 We run each instance with a maximum time limit of 600 seconds
+     resp:
+        - In most of the time the quality of the bounds offered by the relaxed
+          linearization method of Glover is worse than that offered by Glover_Woolsey
+        - However, the upper bound offered by the Glover method at the end of 600 seconds
+          is most of the time better than those of Glover_Woolsey.
+
+Analyse the variation of the computational time necessary to solve the in-
+stances in function of the number of binary variables.
+
+    resp:
+        - It is evident that the computational time grows as the number of binary
+          variables grows, however, the computational time is also affected by the 
+          number of linear constraints. The method that offers the fastest solutions
+          is that of Glover, this is because it does not generate as many additional 
+          restrictions as in Glover_Woolsey.
+        
+Determine the maximum dimension of the instances that can be solved to proven
+optimality within a computing time of 10 minutes.
+
+    resp:
+        - Using Glover: out of 20 instances, only 4 reached the optimal solution 
+          in less than 10 minutes
+        - Using Glover_Woolsey: out of 20 instances, only 4 reached the optimal solution 
+          in less than 10 minutes
+        - the maximum dimension of the instances in both is 220 var binary and 121 contraints
+        - Note: In some cases, it is observed in the method of Glover, 
+          that despite not satisfying the optimality criteria, the best known 
+          integer solution coincides with the optimal solution of the problem.
+        
+Discuss the advantages and the disadvantages of the two linearization teachniques.
+
+    resp:
+        disadvantages Glover_Woolsey
+        - the size of the reformulation increases quadratically
+        - this linearization doubles the number of additional constraints added.
+          This drawback could be problematic in the case when the
+          size of original QP becomes very large
+          
+        advantages Glover_Woolsey
+        - The big advantage of this new linearization is that the variable  
+          need not anymore be declared as binary
+        
+        disadvantages Glover
+        - requires a linear number of additional variables and constraints
+        
+        advenatgaes GLover
+        - This technique yields a much smaller number of additional constraints
+
+        
+Discuss the results as you were in machine learning data center to convince the
+management to adopt one or the other linearization technique.
+
+    resp:
+        - Since in the problem QPLIB_7144 when using the method of Glover
+          the computation time was 10 times faster than that of Glover_Woolsey,
+          I recommend using the Glover method, no matter that the upper bound
+          of method relaxed is worse, in most of the times, it is possible to 
+          reach the optimal solution of the problem, even without reaching 
+          satisfy gap tolerance.
+        
+'''
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+The second study: the QP, or Glover's linearization, of every instance of
+qplib/ within the time 600 s per job would take on all the cores,
+exported to export_dataframe_<method>_size.csv. Run from the directory of
+qplib/ and instancedata.csv, with the package installed:
+
+    python scripts/study_sizes.py
+"""
+
+import os
+import pandas as pd
+
+from qplib.backends import _has_gurobi
+from qplib.runner import jobs_for
+from qplib.scheduling import run_campaign
+from qplib.store import open_results, add_result, results_done, read_results
+
+
+if __name__ == '__main__':
+    
+    # I read the database from where I have the information of all the problems 
+    # of the given page
+
+    datos = pd.read_csv('instancedata.csv')  
+
+    # Gurobi when it is installed, HiGHS (linearizations only) otherwise
+    backend = "gurobi" if _has_gurobi() else "highs"
+    params = {"backend": backend}
+
+    # the results solved so far, kept across runs
+    results = open_results()
+
+    # filter the data of interest
+    datosA = datos[["name","objsense","nbinvars","nvars","ncons","probtype","solobjvalue"]].copy()
+
+    # every instance bundled in qplib/, whatever its type
+    datosA = datosA.loc[[os.path.exists('qplib/' + name + '.qplib') for name in datosA['name']]]
+
+    print(datosA.dtypes)
+
+    # I check if there is Nan
+    print("How much NaN: ",len(datosA[pd.isnull(datosA.solobjvalue)]))
+
+    # I fill the missing data with zeros
+    if len(datosA[pd.isnull(datosA.solobjvalue)]) > 0:
+        datosA['solobjvalue'] = datosA['solobjvalue'].fillna(0)
+
+    # I order the data from smallest to largest number of binary variables
+    datosA = datosA.sort_values('nbinvars')
+
+    # total problem 
+    numproblem = len(datosA)
+
+    # the QP, or Glover's linearization only, of every instance not solved yet
+    done = results_done(results, params)
+    jobs = [job for nameproblem in datosA['name'] for job in jobs_for(nameproblem, backend=backend) if job[1] != "GW" and job not in done]
+
+    # in the time 600 s per job would take on all the cores, the budget
+    # of the jobs solved early going to the hard ones
+    workers = os.cpu_count() or 1
+    for job, result in run_campaign(jobs, 600*len(jobs)/workers, workers=workers, backend=backend, datos=datos, results=results):
+
+        print(job[0], job[1])
+        add_result(results, job, params, result)
+
+    for method in ("QP", "G"):
+        data_size = read_results(results, method, params)
+        data_size = data_size[data_size['name'].isin(datosA['name'])]
+        data_size.to_csv ('export_dataframe_' + method + '_size.csv', index = False, header=True)
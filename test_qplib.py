@@ -0,0 +1,1145 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of readaQP against the bundled qplib/ files and instancedata.csv
+"""
+
+import glob
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+
+from qplib import benchmarks, cli, formulations, heuristics, instances, presolve, racing, runner, scheduling, store, verification
+from qplib.instances import readaQP
+from qplib.model import _failed_result
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+NAMES = sorted(os.path.basename(f)[:-6] for f in glob.glob(os.path.join(HERE, 'qplib', '*.qplib')))
+
+
+@pytest.fixture(autouse=True)
+def repodir(monkeypatch, tmp_path):
+
+    # readaQP reads qplib/<name>.qplib relative to the working directory;
+    # every test gets an empty cache of its own
+    monkeypatch.chdir(HERE)
+    monkeypatch.setattr(instances, 'cachepath', str(tmp_path / 'cache'))
+
+
+@pytest.fixture(scope='module')
+def datos():
+    return pd.read_csv(os.path.join(HERE, 'instancedata.csv')).set_index('name')
+
+
+def reference_readaQP(nameproblem):
+
+    # row by row reading of a QBL file, as the reader did before the sections
+    # were tokenized in bulk
+
+    with open('qplib/' + nameproblem + '.qplib') as fp:
+        rows = iter(fp.read().splitlines())
+
+    first = lambda: next(rows).split()[0]
+
+    for k in range(3):
+        next(rows)
+    n = int(first())
+    m = int(first())
+
+    Q0 = np.zeros((n,n))
+    for k in range(int(first())):
+        term = next(rows).split()
+        Q0[int(term[0])-1,int(term[1])-1] = float(term[2])
+
+    b0 = np.zeros(n) + float(first())
+    for k in range(int(first())):
+        term = next(rows).split()
+        b0[int(term[0])-1] = float(term[1])
+
+    q0 = float(first())
+
+    A0 = np.zeros((m,n))
+    for k in range(int(first())):
+        term = next(rows).split()
+        A0[int(term[0])-1,int(term[1])-1] = float(term[2])
+
+    first()
+    bounds = []
+    for k in range(2):
+        c = np.zeros(m) + float(first())
+        for k in range(int(first())):
+            term = next(rows).split()
+            c[int(term[0])-1] = float(term[1])
+        bounds.append(c)
+
+    return n, m, Q0, b0, q0, A0, bounds[0], bounds[1]
+
+
+def test_every_file_parses(datos):
+
+    assert len(NAMES) == 52
+
+
+@pytest.mark.parametrize('nameproblem', NAMES)
+def test_readaQP_matches_instancedata(nameproblem, datos):
+
+    problem = readaQP(nameproblem)
+    info = datos.loc[nameproblem]
+
+    assert problem.name == nameproblem
+    # the variable letter of the file and of instancedata.csv may differ (QGL/QML)
+    assert problem.typee[0::2] == info['probtype'][0::2]
+    assert problem.sense[:3] == info['objsense']
+    assert problem.n == info['nvars']
+    assert problem.m == info['ncons']
+    assert problem.Q0.nnz == info['nobjquadnz']
+    assert len(problem.Qc) == info['nquadcons']
+    assert np.sum(problem.vtype == 'C') == info['ncontvars']
+    assert np.sum(problem.vtype != 'C') == info['nbinvars'] + info['nintvars']
+    assert problem.linearizable() == (problem.typee[1:] in ('BL', 'BB', 'BN'))
+
+    assert problem.b0.shape == problem.l.shape == problem.u.shape == problem.x0.shape == (problem.n,)
+    assert problem.ccl.shape == problem.ccu.shape == problem.y0.shape == (problem.m,)
+    assert np.all(problem.l <= problem.u)
+    assert np.all(problem.ccl <= problem.ccu)
+
+
+@pytest.mark.parametrize('nameproblem', [name for name in NAMES if name in ('QPLIB_0067', 'QPLIB_0633', 'QPLIB_0752')])
+def test_readaQP_matches_reference_reader(nameproblem):
+
+    n, m, Q0, b0, q0, A0, ccl, ccu = reference_readaQP(nameproblem)
+
+    name,typee,sense,nn,mm,QQ0,bb0,qq0,AA0,ccll,ccuu = readaQP(nameproblem)
+
+    assert (name, typee) == ([nameproblem], ['QBL'])
+    assert sense[0][0] in ('minimize', 'maximize')
+    assert (nn, mm, qq0) == (n, m, q0)
+    assert np.array_equal(QQ0.toarray(), Q0)
+    assert np.array_equal(AA0.toarray(), A0)
+    assert np.array_equal(bb0, b0)
+    assert np.array_equal(ccll, ccl)
+    assert np.array_equal(ccuu, ccu)
+
+
+def assert_same_problem(a, b):
+
+    for key in ('name', 'typee', 'sense', 'n', 'm', 'q0', 'cinfmas', 'varnames', 'connames'):
+        assert getattr(a, key) == getattr(b, key)
+    for key in ('b0', 'ccl', 'ccu', 'l', 'u', 'vtype', 'x0', 'y0', 'z0'):
+        assert np.array_equal(getattr(a, key), getattr(b, key))
+    assert (a.Q0 != b.Q0).nnz == 0
+    assert (a.A0 != b.A0).nnz == 0
+    assert sorted(a.Qc) == sorted(b.Qc)
+    for i in a.Qc:
+        assert (a.Qc[i] != b.Qc[i]).nnz == 0
+
+
+@pytest.mark.parametrize('nameproblem', ['QPLIB_0067', 'QPLIB_0018', 'QPLIB_1976', 'QPLIB_0681'])
+def test_cache_returns_the_parsed_problem(nameproblem):
+
+    parsed = readaQP(nameproblem, cache=False)
+    first = readaQP(nameproblem)
+    cached = readaQP(nameproblem)
+
+    assert_same_problem(parsed, first)
+    assert_same_problem(parsed, cached)
+
+    # zero-copy: the arrays are views of the memory-mapped entry
+    assert isinstance(cached.b0, np.memmap)
+    assert not cached.A0.data.flags.owndata and not cached.A0.data.flags.writeable
+
+
+def test_cache_invalidated_when_the_file_changes(tmp_path, monkeypatch):
+
+    os.makedirs(str(tmp_path / 'qplib'))
+    source = str(tmp_path / 'qplib' / 'QPLIB_0067.qplib')
+    shutil.copy(os.path.join(HERE, 'qplib', 'QPLIB_0067.qplib'), source)
+    monkeypatch.chdir(tmp_path)
+
+    assert readaQP('QPLIB_0067').ccu[0] == 1555.0
+
+    # same content, new mtime: still served from the cache
+    os.utime(source, ns=(0, 0))
+    assert isinstance(readaQP('QPLIB_0067').ccu, np.memmap)
+
+    with open(source) as fp:
+        text = fp.read()
+    with open(source, 'w') as fp:
+        fp.write(text.replace('1555.0 # default right-hand-side value', '1556.0 # default right-hand-side value'))
+
+    problem = readaQP('QPLIB_0067')
+    assert problem.ccu[0] == 1556.0
+    assert not isinstance(problem.ccu, np.memmap)
+
+
+def test_cache_entry_removed_while_it_is_read(monkeypatch):
+
+    # another process replaces the entry between the loads and the utime
+    readaQP('QPLIB_0067')
+    utime = os.utime
+
+    def replaced(path, *args, **kwargs):
+        shutil.rmtree(os.path.dirname(path))
+        return utime(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'utime', replaced)
+    assert readaQP('QPLIB_0067').n == 80
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+
+    entrysize = lambda name: sum(os.path.getsize(f) for f in glob.glob(os.path.join(instances.cachepath, name, '*')))
+
+    for name in ('QPLIB_0067', 'QPLIB_0633', 'QPLIB_0018'):
+        readaQP(name)
+    for name in ('QPLIB_0067', 'QPLIB_0633', 'QPLIB_0018'):
+        os.utime(os.path.join(instances.cachepath, name, 'meta.json'), (0, 0))
+
+    # a hit makes QPLIB_0067 the most recently used, QPLIB_0633 is now the oldest
+    readaQP('QPLIB_0067')
+    os.utime(os.path.join(instances.cachepath, 'QPLIB_0633', 'meta.json'), (-1, -1))
+
+    monkeypatch.setattr(instances, 'cachesize', entrysize('QPLIB_0067') + entrysize('QPLIB_0018'))
+    instances._cache_evict()
+
+    assert sorted(os.listdir(instances.cachepath)) == ['QPLIB_0018', 'QPLIB_0067']
+
+
+def test_cache_evict_skips_the_entries_of_other_writers(monkeypatch):
+
+    readaQP('QPLIB_0067')
+    readaQP('QPLIB_0633')
+    partial = os.path.join(instances.cachepath, 'QPLIB_0018.123.partial')
+    shutil.copytree(os.path.join(instances.cachepath, 'QPLIB_0067'), partial)
+
+    # an entry evicted by another worker while it is scanned
+    listdir = os.listdir
+    def vanishing(path):
+        if path.endswith('QPLIB_0633'):
+            raise FileNotFoundError(path)
+        return listdir(path)
+    monkeypatch.setattr(os, 'listdir', vanishing)
+    monkeypatch.setattr(instances, 'cachesize', 0)
+    instances._cache_evict()
+
+    assert sorted(listdir(instances.cachepath)) == ['QPLIB_0018.123.partial', 'QPLIB_0633']
+
+
+def small_QBL(sense, seed=0, n=10):
+
+    # a QBL instance small enough to enumerate, with a free, a ranged and
+    # an upper-bounded row
+    rng = np.random.default_rng(seed)
+    Q0 = sp.csr_matrix(np.tril(rng.integers(-9, 10, (n,n)))*(rng.random((n,n)) < 0.5))
+    b0 = rng.integers(-5, 6, n).astype(float)
+    A0 = sp.csr_matrix(rng.integers(0, 4, (3,n)).astype(float))
+    ccl = np.array([-np.inf, 2.0, -np.inf])
+    ccu = np.array([np.inf, 8.0, 9.0])
+    return ['SMALL'],['QBL'],[[sense]],n,3,Q0,b0,1.5,A0,ccl,ccu
+
+
+def brute_force(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu):
+
+    X = np.array(list(itertools.product((0, 1), repeat=n)), dtype=float)
+    obj = 0.5*np.einsum('ki,ij,kj->k', X, Q0.toarray(), X) + X @ b0 + q0
+    Ax = (A0 @ X.T).T
+    feasible = np.all((Ax >= ccl - 1e-9) & (Ax <= ccu + 1e-9), axis=1)
+    if sense[0][0] == 'minimize':
+        return obj[feasible].min()
+    return obj[feasible].max()
+
+
+def test_highs_relaxation_is_charged_to_the_time_limit(monkeypatch):
+
+    # every milp call takes 1 s of the 1.5 s limit and gets what is left
+    from qplib.backends import highs
+    limits = []
+    milp = highs.milp
+    def slow(*args, options=None, **kwargs):
+        limits.append(options['time_limit'])
+        time.sleep(1.0)
+        return milp(*args, options=options, **kwargs)
+    monkeypatch.setattr(highs, 'milp', slow)
+
+    result = formulations.solve_Glover_gurobi(*small_QBL('minimize'), backend='highs', timelimit=1.5, relax='root', lpfile=None)
+
+    assert limits[0] == pytest.approx(1.5, abs=0.01) and limits[1] < 0.6
+    assert result['timerun'] >= 2.0 and np.isfinite(result['solrelax'])
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+@pytest.mark.parametrize('solve', ['solve_Glover_Woolsey_gurobi', 'solve_Glover_gurobi', 'solve_QP_gurobi'])
+@pytest.mark.parametrize('backend', ['gurobi', 'highs'])
+def test_formulations_reach_the_enumerated_optimum(backend, solve, sense):
+
+    if backend == 'gurobi':
+        pytest.importorskip('gurobipy')
+    if backend == 'highs' and solve == 'solve_QP_gurobi':
+        pytest.skip('the HiGHS backend solves linear models only')
+    problem = small_QBL(sense)
+
+    result = getattr(formulations, solve)(*problem, backend=backend)
+
+    assert result['status'] == 2
+    assert result['solobj'] == pytest.approx(brute_force(*problem))
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+def test_QP_with_a_quadratic_row_reaches_the_enumerated_optimum(sense):
+
+    pytest.importorskip('gurobipy')
+    name,typee,_,n,m,Q0,b0,q0,A0,ccl,ccu = small_QBL(sense, seed=6)
+    rng = np.random.default_rng(6)
+    Qc = {0: sp.csr_matrix(np.tril(rng.integers(-3, 4, (n,n))))}
+    ccu = ccu.copy()
+    ccu[0] = 6.0
+
+    result = formulations.solve_QP_gurobi(name,typee,[[sense]],n,m,Q0,b0,q0,A0,ccl,ccu,Qc=Qc,lpfile=None)
+
+    X = np.array(list(itertools.product((0, 1), repeat=n)), dtype=float)
+    obj = 0.5*np.einsum('ki,ij,kj->k', X, Q0.toarray(), X) + X @ b0 + q0
+    Ax = (A0 @ X.T).T
+    Ax[:, 0] += 0.5*np.einsum('ki,ij,kj->k', X, Qc[0].toarray(), X)
+    feasible = np.all((Ax >= ccl - 1e-9) & (Ax <= ccu + 1e-9), axis=1)
+    best = obj[feasible].min() if sense == 'minimize' else obj[feasible].max()
+    assert result['status'] == 2
+    assert result['solobj'] == pytest.approx(best)
+
+
+def test_QP_over_binaries_skips_the_convexity_check(monkeypatch):
+
+    def eigenvalue(*args):
+        raise AssertionError('eigenvalue of a binary objective')
+
+    monkeypatch.setattr(formulations, '_eigmin', eigenvalue)
+    model = formulations.build_QP(*small_QBL('minimize', seed=6))
+
+    assert not model.nonconvex
+    n = model.Q.shape[0]
+    with pytest.raises(AssertionError):
+        formulations.build_QP(*small_QBL('minimize', seed=6), vtype=np.full(n, 'C'))
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+@pytest.mark.parametrize('solve', ['solve_Glover_Woolsey_gurobi', 'solve_Glover_gurobi'])
+def test_root_relaxation_is_between_the_lp_and_the_optimum(solve, sense):
+
+    pytest.importorskip('gurobipy')
+    problem = small_QBL(sense, seed=1, n=14)
+    solve = getattr(formulations, solve)
+
+    root = solve(*problem, relax='root', lpfile=None)
+    lp = solve(*problem, relax='lp', lpfile=None)
+
+    sign = 1 if sense == 'minimize' else -1
+    assert sign*lp['solrelax'] <= sign*root['solrelax'] + 1e-6
+    assert sign*root['solrelax'] <= sign*root['solobj'] + 1e-6
+    assert np.isnan(solve(*problem, relax=False, lpfile=None)['solrelax'])
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+@pytest.mark.parametrize('solve', ['solve_Glover_Woolsey_gurobi', 'solve_Glover_gurobi'])
+def test_linearizations_without_presolve(solve, sense):
+
+    pytest.importorskip('gurobipy')
+    problem = small_QBL(sense)
+
+    result = getattr(formulations, solve)(*problem, presolve=False, lpfile=None)
+
+    assert result['solobj'] == pytest.approx(brute_force(*problem))
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+def test_compact_Glover_Woolsey_has_the_same_bound_and_optimum(sense):
+
+    problem = small_QBL(sense, seed=2, n=12)
+    full = formulations.build_Glover_Woolsey(*problem)
+    compact = formulations.build_Glover_Woolsey(*problem, compact=True)
+
+    assert compact.matrix()[0].shape[0] < full.matrix()[0].shape[0]
+    for relax in ('lp', False):
+        a = formulations.solve_Glover_Woolsey_gurobi(*problem, backend='highs', relax=relax, lpfile=None, presolve=False)
+        b = formulations.solve_Glover_Woolsey_gurobi(*problem, backend='highs', relax=relax, lpfile=None, presolve=False, compact=True)
+        assert b['solobj'] == pytest.approx(brute_force(*problem)) == pytest.approx(a['solobj'])
+        assert b['solrelax'] == pytest.approx(a['solrelax'], nan_ok=True)
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+@pytest.mark.parametrize('backend', ['highs', 'gurobi'])
+@pytest.mark.parametrize('compact', [False, True])
+def test_lazy_Glover_Woolsey_has_the_same_bound_and_optimum(compact, backend, sense):
+
+    if backend == 'gurobi':
+        pytest.importorskip('gurobipy')
+    problem = small_QBL(sense, seed=2, n=12)
+    full = formulations.build_Glover_Woolsey(*problem)
+    lazy = formulations.build_Glover_Woolsey(*problem, compact=compact, lazy=True)
+
+    assert lazy.matrix()[0].shape[0] == problem[8].shape[0]
+    assert lazy.matrix(lazy=True)[0].shape[0] < full.matrix()[0].shape[0]
+    a = formulations.solve_Glover_Woolsey_gurobi(*problem, backend='highs', relax='lp', lpfile=None, presolve=False)
+    b = formulations.solve_Glover_Woolsey_gurobi(*problem, backend=backend, relax='lp', lpfile=None, presolve=False, compact=compact, lazy=True)
+    assert b['status'] == 2
+    assert b['solobj'] == pytest.approx(brute_force(*problem))
+    assert b['solrelax'] == pytest.approx(a['solrelax'])
+
+
+def test_lazy_HiGHS_keeps_an_incumbent_at_the_time_limit(monkeypatch):
+
+    from qplib.backends import highs
+    milp = highs.milp
+    rounds = []
+
+    def slow(c, integrality=None, **options):
+        # the time is over after the first MILP, whose solution violates
+        # lazy rows
+        res = milp(c, integrality=integrality, **options)
+        if integrality.any():
+            rounds.append(res.x)
+            time.sleep(3.0)
+        return res
+
+    monkeypatch.setattr(highs, 'milp', slow)
+    problem = readaQP('QPLIB_0633')
+
+    result = formulations.solve_Glover_Woolsey_gurobi(*problem, backend='highs', relax=False, lpfile=None, lazy=True, timelimit=3)
+
+    assert len(rounds) == 1
+    assert result['status'] == 9
+    evaluation = verification.evaluate_solutions(problem, result['x']).iloc[0]
+    assert evaluation['feasible'] and evaluation['objective'] == pytest.approx(result['solobj'])
+    assert result['solBound'] <= 79.56070622 <= result['solobj']
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+@pytest.mark.parametrize('backend', ['highs', 'gurobi'])
+def test_triangles_tighten_the_Glover_Woolsey_bound(backend, sense):
+
+    if backend == 'gurobi':
+        pytest.importorskip('gurobipy')
+    problem = small_QBL(sense, seed=2, n=12)
+    x = np.random.default_rng(0).integers(0, 2, 12).astype(float)
+    model = formulations.build_Glover_Woolsey(*problem, start=x, triangles=True)
+
+    # every binary point with y = x_i x_j satisfies the triangles
+    A, rl, ru = model.matrix(lazy=True)
+    assert A.shape[0] > 0
+    assert np.all(A @ model.start <= ru + 1e-9)
+
+    a = formulations.solve_Glover_Woolsey_gurobi(*problem, backend='highs', relax='lp', lpfile=None, presolve=False)
+    b = formulations.solve_Glover_Woolsey_gurobi(*problem, backend=backend, relax='lp', lpfile=None, presolve=False, lazy=True, triangles=True)
+    sign = 1 if sense == 'minimize' else -1
+    assert b['solobj'] == pytest.approx(brute_force(*problem))
+    assert sign*a['solrelax'] <= sign*b['solrelax'] + 1e-6 <= sign*b['solobj'] + 2e-6
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+@pytest.mark.parametrize('formulation, options', [('RLT', {}), ('QCR', {'shift': 'eig'}), ('QCR', {'shift': 'gershgorin'})])
+def test_registered_formulations_reach_the_enumerated_optimum(formulation, options, sense):
+
+    pytest.importorskip('gurobipy')
+    problem = small_QBL(sense, seed=3, n=12)
+
+    result = formulations.solve_formulation(formulation, *problem, presolve=False, **options)
+
+    assert result['status'] == 2
+    assert result['solobj'] == pytest.approx(brute_force(*problem))
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+def test_RLT_bound_is_at_least_the_Glover_Woolsey_bound(sense):
+
+    problem = small_QBL(sense, seed=2, n=12)
+
+    gw = formulations.solve_formulation('GW', *problem, backend='highs', relax='lp', presolve=False)
+    rlt = formulations.solve_formulation('RLT', *problem, backend='highs', relax='lp', presolve=False)
+
+    sign = 1 if sense == 'minimize' else -1
+    assert rlt['solobj'] == pytest.approx(brute_force(*problem))
+    assert sign*gw['solrelax'] <= sign*rlt['solrelax'] + 1e-6 <= sign*rlt['solobj'] + 2e-6
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+@pytest.mark.parametrize('shift', ['eig', 'gershgorin'])
+def test_QCR_objective_is_convex_and_unchanged_on_binaries(shift, sense):
+
+    problem = small_QBL(sense, seed=5)
+    x = enumerated_optimum(*problem)
+
+    model = formulations.build_QCR(*problem, shift=shift)
+
+    sign = 1 if sense == 'minimize' else -1
+    assert formulations._is_convex(model.Q, sign)
+    assert 0.5*x @ (model.Q @ x) + model.c @ x + model.constant == pytest.approx(brute_force(*problem))
+
+
+@pytest.mark.parametrize('seed', range(6))
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+def test_presolve_keeps_the_optimum(seed, sense):
+
+    # a sign pattern that lets the presolve fix variables
+    name,typee,_,n,m,Q0,b0,q0,A0,ccl,ccu = small_QBL(sense, seed=seed)
+    Q0 = abs(Q0) if seed % 2 else -abs(Q0)
+    A0 = sp.csr_matrix(A0.toarray()*(np.arange(n) < 6))
+    problem = (name,typee,[[sense]],n,m,Q0,b0,q0,A0,ccl,ccu)
+
+    reduced, fixed = presolve.presolve_QBL(*problem)
+
+    assert reduced[3] == np.isnan(fixed).sum() < n
+    assert reduced[5].diagonal().sum() == 0 and sp.triu(reduced[5]).nnz == 0
+    assert brute_force(*reduced) == pytest.approx(brute_force(*problem))
+
+
+def two_blocks(sense):
+
+    # two small_QBL side by side, the second over the variables 8..15
+    first, second = small_QBL(sense, seed=1, n=8), small_QBL(sense, seed=2, n=8)
+    Q0 = sp.block_diag([first[5], second[5]], format='csr')
+    A0 = sp.block_diag([first[8], second[8]], format='csr')
+    return (['BLOCKS'],['QBL'],[[sense]],16,6,Q0,np.concatenate([first[6], second[6]]),3.0,A0,
+            np.concatenate([first[9], second[9]]),np.concatenate([first[10], second[10]]))
+
+
+def test_split_QBL_finds_the_blocks():
+
+    problem = two_blocks('minimize')
+
+    blocks = presolve.split_QBL(*problem)
+
+    assert [list(columns) for _, columns in blocks] == [list(range(8)), list(range(8, 16))]
+    assert brute_force(*blocks[0][0]) + brute_force(*blocks[1][0]) == pytest.approx(brute_force(*problem))
+
+    # a row without variables that does not hold keeps the problem whole
+    name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu = problem
+    A0 = sp.vstack([A0, sp.csr_matrix((1, n))]).tocsr()
+    assert len(presolve.split_QBL(name,typee,sense,n,m+1,Q0,b0,q0,A0,np.append(ccl, 1.0),np.append(ccu, np.inf))) == 1
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_solve_decomposed_merges_the_blocks(workers, sense):
+
+    problem = two_blocks(sense)
+    Q0, b0, q0 = problem[5], problem[6], problem[7]
+
+    result = formulations.solve_decomposed('GW', *problem, workers=workers, backend='highs', relax='lp', timelimit=60)
+
+    assert result['blocks'] == 2 and result['status'] == 2
+    assert result['solobj'] == pytest.approx(brute_force(*problem))
+    x = result['x']
+    assert 0.5*x @ (Q0 @ x) + b0 @ x + q0 == pytest.approx(result['solobj'])
+    assert result['numvars'] == sum(formulations.build_Glover_Woolsey(*block).size()[0] for block, _ in presolve.split_QBL(*presolve.presolve_QBL(*problem)[0]))
+
+
+def test_solve_decomposed_shares_the_time_limit(monkeypatch):
+
+    problem = two_blocks('minimize')
+    solve_formulation = formulations.solve_formulation
+    limits = []
+
+    def solve(formulation, *block, timelimit=None, **options):
+        limits.append(timelimit)
+        time.sleep(1.0)
+        return solve_formulation(formulation, *block, timelimit=timelimit, **options)
+
+    monkeypatch.setattr(formulations, 'solve_formulation', solve)
+    result = formulations.solve_decomposed('GW', *problem, workers=1, backend='highs', relax=False, timelimit=10)
+
+    # half the time to the first block, what it leaves to the second
+    assert result['status'] == 2
+    assert limits[0] == pytest.approx(5.0, abs=0.1) and limits[1] > 5.0
+
+
+def test_solve_decomposed_presolves_one_block_once(monkeypatch):
+
+    problem = small_QBL('minimize', seed=3, n=12)
+    presolve_QBL = presolve.presolve_QBL
+    calls = []
+
+    def counted(*problem):
+        calls.append(problem)
+        return presolve_QBL(*problem)
+
+    monkeypatch.setattr(formulations, 'presolve_QBL', counted)
+    result = formulations.solve_decomposed('GW', *problem, backend='highs', relax=False, timelimit=60)
+
+    assert len(calls) == 1 and result['blocks'] == 1
+    x = result['x']
+    assert len(x) == problem[3]
+    assert result['solobj'] == pytest.approx(brute_force(*problem)) == pytest.approx(0.5*x @ (problem[5] @ x) + problem[6] @ x + problem[7])
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+def test_tightened_Glover_reports_the_objective_of_its_solution(sense):
+
+    problem = small_QBL(sense, seed=3, n=12)
+    Q0, b0, q0 = problem[5], problem[6], problem[7]
+
+    result = formulations.solve_Glover_gurobi(*problem, backend='highs', tighten=True, threads=1, lpfile=None)
+
+    x = result['x']
+    assert result['solobj'] == 0.5*x @ (Q0 @ x) + b0 @ x + q0
+    assert result['solobj'] == pytest.approx(brute_force(*problem), abs=1e-9)
+
+
+def tighten_in_a_worker(results):
+
+    # the tightening in a worker process, with process pools forbidden
+    import concurrent.futures
+    def forbidden(*args, **kwargs):
+        raise AssertionError('a pool in a worker')
+    concurrent.futures.ProcessPoolExecutor = forbidden
+    name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu = small_QBL('minimize', seed=3, n=12)
+    Q00 = 0.25*(Q0 + Q0.transpose()).tocsr()
+    Qmas = np.asarray(Q00.maximum(0).sum(axis=1)).ravel()
+    Qmenos = np.asarray(Q00.minimum(0).sum(axis=1)).ravel()
+    results.put(formulations.tighten_Glover_bounds(Q00, A0, ccl, ccu, 'minimize', Qmas, Qmenos))
+
+
+def test_tightened_Glover_bounds_run_serially_in_a_worker():
+
+    import multiprocessing as mp
+    results = mp.Queue()
+    worker = mp.Process(target=tighten_in_a_worker, args=(results,))
+    worker.start()
+    tightmas, tightmenos = results.get(timeout=60)
+    worker.join()
+
+    assert worker.exitcode == 0 and len(tightmas) == 12
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+def test_tightened_Glover_bounds_hold_on_every_feasible_point(sense):
+
+    name,typee,_,n,m,Q0,b0,q0,A0,ccl,ccu = small_QBL(sense, seed=3, n=12)
+    Q00 = 0.25*(Q0 + Q0.transpose()).tocsr()
+    Qmas = np.asarray(Q00.maximum(0).sum(axis=1)).ravel()
+    Qmenos = np.asarray(Q00.minimum(0).sum(axis=1)).ravel()
+
+    tightmas, tightmenos = formulations.tighten_Glover_bounds(Q00, A0, ccl, ccu, sense, Qmas, Qmenos, workers=2)
+
+    assert np.all(tightmas <= Qmas) and np.all(tightmenos >= Qmenos)
+    assert np.any(tightmas < Qmas) or np.any(tightmenos > Qmenos)
+
+    X = np.array(list(itertools.product((0, 1), repeat=n)), dtype=float)
+    Ax = (A0 @ X.T).T
+    X = X[np.all((Ax >= ccl) & (Ax <= ccu), axis=1)]
+    sums = X @ Q00.toarray()
+    if sense == 'minimize':
+        assert np.all(sums >= tightmenos - 1e-9, where=X == 1)
+        assert np.all(sums <= tightmas + 1e-9, where=X == 0)
+    else:
+        assert np.all(sums <= tightmas + 1e-9, where=X == 1)
+        assert np.all(sums >= tightmenos - 1e-9, where=X == 0)
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+def test_tabu_search_finds_the_enumerated_optimum(seed, sense):
+
+    problem = small_QBL(sense, seed=seed, n=12)
+    name,typee,_,n,m,Q0,b0,q0,A0,ccl,ccu = problem
+
+    x, obj = heuristics.tabu_search(Q0, b0, A0, ccl, ccu, sense, iterations=2000, seed=seed)
+
+    assert np.all((A0 @ x >= ccl) & (A0 @ x <= ccu))
+    assert obj == pytest.approx(0.5*x @ (Q0 @ x) + b0 @ x)
+    assert obj + q0 == pytest.approx(brute_force(*problem))
+
+
+def test_solve_tabu_as_a_method():
+
+    problem = readaQP('QPLIB_0633')
+
+    # bounded by moves, not by time, to find the same point on every machine
+    result = runner.methods['TS'](*problem, iterations=2000, timelimit=600, seed=0)
+
+    assert result['status'] == 13
+    evaluation = verification.evaluate_solutions(problem, result['x']).iloc[0]
+    assert evaluation['feasible'] and evaluation['objective'] == pytest.approx(result['solobj'])
+    assert 79.56070621630002 - 1e-6 <= result['solobj'] <= 80.0
+
+
+@pytest.mark.parametrize('solve', ['solve_Glover_Woolsey_gurobi', 'solve_Glover_gurobi'])
+def test_linearizations_with_a_heuristic_start(solve):
+
+    pytest.importorskip('gurobipy')
+    problem = small_QBL('minimize', seed=2, n=12)
+
+    result = getattr(formulations, solve)(*problem, heuristic=1, lpfile=None)
+
+    assert result['solobj'] == pytest.approx(brute_force(*problem))
+
+
+def enumerated_optimum(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu):
+
+    X = np.array(list(itertools.product((0, 1), repeat=n)), dtype=float)
+    obj = 0.5*np.einsum('ki,ij,kj->k', X, Q0.toarray(), X) + X @ b0 + q0
+    Ax = (A0 @ X.T).T
+    obj[~np.all((Ax >= ccl - 1e-9) & (Ax <= ccu + 1e-9), axis=1)] = np.nan
+    if sense[0][0] == 'minimize':
+        return X[np.nanargmin(obj)]
+    return X[np.nanargmax(obj)]
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+@pytest.mark.parametrize('build', ['build_QP', 'build_Glover_Woolsey', 'build_Glover'])
+def test_start_gives_a_feasible_point_of_the_model(build, sense):
+
+    problem = small_QBL(sense, seed=4)
+    x = enumerated_optimum(*problem)
+
+    model = getattr(formulations, build)(*problem, start=x)
+    A, rl, ru = model.matrix()
+    z = model.start
+
+    # the range columns of the rows are not in the model, only in the backend
+    assert not np.isnan(z).any()
+    assert np.all((A @ z >= rl - 1e-9) & (A @ z <= ru + 1e-9))
+    objective = model.c @ z + model.constant
+    if model.Q is not None:
+        objective += 0.5*z @ (model.Q @ z)
+    assert objective == pytest.approx(brute_force(*problem))
+
+
+@pytest.mark.parametrize('solve', ['solve_Glover_Woolsey_gurobi', 'solve_Glover_gurobi', 'solve_QP_gurobi'])
+def test_solution_on_the_variables_of_the_problem(solve):
+
+    pytest.importorskip('gurobipy')
+    name,typee,_,n,m,Q0,b0,q0,A0,ccl,ccu = small_QBL('minimize', seed=1, n=14)
+    Q0 = -abs(Q0)
+    problem = (name,typee,[['minimize']],n,m,Q0,b0,q0,A0,ccl,ccu)
+
+    result = getattr(formulations, solve)(*problem, lpfile=None, start=np.zeros(n))
+
+    x = result['x']
+    assert len(x) == n
+    assert 0.5*x @ (Q0 @ x) + b0 @ x + q0 == pytest.approx(result['solobj'])
+
+
+def first(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,**options):
+    return dict(_failed_result(name[0]), status=2, solobj=-1.0, x=np.ones(n))
+
+
+def second(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,**options):
+    start = options['start']
+    return dict(_failed_result(name[0]), status=2, solobj=0.0 if start is None else start.sum(), x=None)
+
+
+def test_run_batch_reuses_the_best_solution_of_an_instance(monkeypatch):
+
+    monkeypatch.setattr(runner, 'methods', {'FIRST': first, 'SECOND': second})
+    jobs = [('QPLIB_0067', 'FIRST'), ('QPLIB_0067', 'SECOND'), ('QPLIB_0633', 'SECOND')]
+
+    results = dict(runner.run_batch(jobs, workers=1, threads=1))
+
+    assert results[('QPLIB_0067', 'SECOND')]['solobj'] == readaQP('QPLIB_0067').n
+    assert results[('QPLIB_0633', 'SECOND')]['solobj'] == 0.0
+
+    results = dict(runner.run_batch(jobs, workers=1, threads=1, reuse=False))
+    assert results[('QPLIB_0067', 'SECOND')]['solobj'] == 0.0
+
+
+def test_jobs_for_routes_by_problem_type():
+
+    assert runner.jobs_for('QPLIB_0067') == [('QPLIB_0067', 'GW'), ('QPLIB_0067', 'G')]
+    assert runner.jobs_for('QPLIB_0018') == [('QPLIB_0018', 'QP')]
+    # HiGHS solves linear models only
+    assert runner.jobs_for('QPLIB_0018', backend='highs') == []
+    assert runner.jobs_for('QPLIB_0067', ('GW', 'QCR'), backend='highs') == [('QPLIB_0067', 'GW')]
+
+
+def solved(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,**options):
+    return dict(_failed_result(name[0]), status=2, solobj=float(n), threads=options['threads'])
+
+
+def crashed(*problem, **options):
+    os._exit(1)
+
+
+def test_run_batch_survives_a_worker_crash(monkeypatch):
+
+    monkeypatch.setattr(runner, 'methods', {'OK': solved, 'CRASH': crashed})
+    jobs = [('QPLIB_0067', 'OK'), ('QPLIB_0067', 'CRASH'), ('QPLIB_0633', 'OK'), ('QPLIB_0018', 'OK')]
+
+    results = dict(runner.run_batch(jobs, workers=2, threads=3, retries=1))
+
+    assert sorted(results) == sorted(jobs)
+    assert results[('QPLIB_0067', 'OK')]['solobj'] == readaQP('QPLIB_0067').n
+    assert results[('QPLIB_0067', 'OK')]['threads'] == 3
+    # the jobs running next to the crash are solved again
+    assert results[('QPLIB_0633', 'OK')]['status'] == 2
+    assert results[('QPLIB_0018', 'OK')]['status'] == 2
+    assert np.isnan(results[('QPLIB_0067', 'CRASH')]['status'])
+
+
+def fast(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,**options):
+    return dict(_failed_result(name[0]), status=2, solobj=-1.0, solBound=-1.0, x=np.zeros(n))
+
+
+def slow(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,**options):
+    time.sleep(60)
+    return dict(_failed_result(name[0]), status=2, solobj=-2.0, solBound=-2.0, x=np.ones(n))
+
+
+def test_run_race_cancels_the_racers_once_one_is_optimal(monkeypatch):
+
+    monkeypatch.setattr(runner, 'methods', {'FAST': fast, 'SLOW': slow})
+    start = time.time()
+
+    race = racing.run_race('QPLIB_0067', racers=[('SLOW', 'highs'), ('FAST', 'highs')], threads=1, grace=0.5)
+
+    assert time.time() - start < 30
+    assert race['status'] == 2 and race['solobj'] == -1.0
+    assert race['racers'][('FAST', 'highs')]['status'] == 2
+    assert np.isnan(race['racers'][('SLOW', 'highs')]['status'])
+
+
+def test_run_race_keeps_the_best_solution_and_bound_of_the_racers():
+
+    race = racing.run_race('QPLIB_0067', racers=[('GW', 'highs'), ('G', 'highs')], threads=1, timelimit=3)
+
+    racers = list(race['racers'].values())
+    assert race['solobj'] == min(result['solobj'] for result in racers)
+    assert race['solBound'] == max(result['solBound'] for result in racers)
+    assert race['solBound'] <= -110942.0 + 1e-6 <= race['solobj'] + 2e-6
+    assert len(race['x']) == readaQP('QPLIB_0067').n
+
+
+@pytest.mark.parametrize('solve', ['solve_Glover_Woolsey_gurobi', 'solve_Glover_gurobi'])
+def test_racer_shares_its_incumbent(solve, monkeypatch):
+
+    pytest.importorskip('gurobipy')
+    import multiprocessing as mp
+    name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu = small_QBL('minimize', seed=2, n=12)
+    problem = (name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu)
+    X = np.array(list(itertools.product((0, 1), repeat=n)), dtype=float)
+    X = X[np.all(((A0 @ X.T).T >= ccl) & ((A0 @ X.T).T <= ccu), axis=1)]
+    x = X[np.argmin(0.5*np.einsum('ki,ij,kj->k', X, Q0.toarray(), X) + X @ b0)]
+
+    # the optimum it finds is published, on the variables of the problem
+    state = (mp.Value('d', np.inf), mp.Array('d', n, lock=False), mp.Event())
+    monkeypatch.setattr(racing, '_race', state)
+    result = getattr(formulations, solve)(*problem, lpfile=None)
+    assert state[0].value == pytest.approx(brute_force(*problem)) == pytest.approx(result['solobj'])
+    assert np.allclose(state[1][:], result['x'])
+
+    # and one found by another racer is taken, and ends the search
+    state = (mp.Value('d', brute_force(*problem)), mp.Array('d', x, lock=False), mp.Event())
+    monkeypatch.setattr(racing, '_race', state)
+    result = getattr(formulations, solve)(*problem, lpfile=None, presolve=False)
+    assert result['solobj'] == pytest.approx(brute_force(*problem))
+    assert np.allclose(result['x'], x)
+    assert state[2].is_set() or result['status'] == 2
+
+
+@pytest.mark.parametrize('sense', ['minimize', 'maximize'])
+def test_evaluate_solutions_of_every_point(sense):
+
+    problem = small_QBL(sense, seed=4, n=10)
+    name,typee,_,n,m,Q0,b0,q0,A0,ccl,ccu = problem
+    X = np.array(list(itertools.product((0, 1), repeat=n)), dtype=float)
+
+    evaluation = verification.evaluate_solutions(problem, X)
+
+    Ax = (A0 @ X.T).T
+    feasible = np.all((Ax >= ccl) & (Ax <= ccu), axis=1)
+    assert np.allclose(evaluation['objective'], [0.5*x @ (Q0 @ x) + b0 @ x + q0 for x in X])
+    assert np.array_equal(evaluation['feasible'], feasible)
+    sign = 1 if sense == 'minimize' else -1
+    assert (sign*evaluation['objective'][feasible]).min() == pytest.approx(sign*brute_force(*problem))
+
+    # fractional and out of bounds points are not feasible
+    evaluation = verification.evaluate_solutions(problem, [np.full(n, 0.5), np.full(n, 2.0)])
+    assert list(evaluation['integrality']) == [0.5, 0.0]
+    assert list(evaluation['boundviolation']) == [0.0, 1.0]
+    assert not evaluation['feasible'].any()
+
+
+def test_verify_solution_against_the_result_and_the_known_optimum():
+
+    problem = readaQP('QPLIB_0633')
+    datos = pd.read_csv('instancedata.csv')
+    evaluation = verification.evaluate_solutions(problem, np.ones(problem.n)).iloc[0]
+    result = dict(_failed_result('QPLIB_0633'), status=9, solobj=evaluation['objective'], x=np.ones(problem.n))
+
+    check = verification.verify_solution('QPLIB_0633', result, datos)
+    assert check['feasible'] == evaluation['feasible']
+    assert check['consistent'] and check['known'] == pytest.approx(79.56070622)
+
+    # a solution reported with another objective, or as optimal away from
+    # the known optimum, does not verify
+    assert not verification.verify_solution('QPLIB_0633', dict(result, solobj=evaluation['objective'] + 1.0), datos)['consistent']
+    assert not verification.verify_solution('QPLIB_0633', dict(result, status=2), datos)['agrees']
+    assert not verification.verify_solution('QPLIB_0633', dict(result, x=None), datos)['ok']
+
+
+@pytest.mark.parametrize('formulation', ['GW', 'G', 'RLT'])
+def test_solutions_of_the_formulations_verify(formulation):
+
+    problem = small_QBL('maximize', seed=5, n=12)
+
+    result = formulations.solve_formulation(formulation, *problem, backend='highs', relax=False)
+
+    evaluation = verification.evaluate_solutions(problem, result['x']).iloc[0]
+    assert evaluation['feasible']
+    assert evaluation['objective'] == pytest.approx(result['solobj']) == pytest.approx(brute_force(*problem))
+
+
+def test_modules_load_their_solvers_on_first_use():
+
+    # the command line imports neither solver nor pandas, and a HiGHS solve
+    # only scipy.optimize
+    code = ('import sys, qplib.cli, qplib.racing; heavy = ("pandas", "gurobipy", "scipy.optimize"); '
+            'print([m for m in heavy if m in sys.modules]); '
+            'from qplib.instances import readaQP; from qplib.formulations import solve_Glover_gurobi; '
+            'solve_Glover_gurobi(*readaQP("QPLIB_0067", cache=False), backend="highs", timelimit=1, lpfile=None); '
+            'print([m for m in heavy if m in sys.modules])')
+    out = subprocess.run([sys.executable, '-c', code], cwd=HERE, capture_output=True, text=True, check=True).stdout.splitlines()
+
+    assert out[0] == '[]'
+    assert out[-1] == "['scipy.optimize']"
+
+
+def test_main_solves_the_jobs_not_in_the_store(tmp_path, monkeypatch, capsys):
+
+    monkeypatch.setattr(runner, 'methods', {'OK': solved, 'CRASH': crashed})
+    path = str(tmp_path / 'results.sqlite')
+    argv = ['--instances', 'QPLIB_0067', 'QPLIB_0633', '--method', 'OK', '--jobs', '1', '--backend', 'highs', '--results', path]
+
+    assert cli.main(argv) == 0
+    out = capsys.readouterr().out
+    assert 'QPLIB_0067 OK status 2' in out and 'QPLIB_0633 OK status 2' in out
+
+    # a second run has nothing left to solve
+    assert cli.main(argv) == 0
+    assert 'status' not in capsys.readouterr().out
+    results = store.open_results(path)
+    assert len(store.read_results(results, 'OK', {'backend': 'highs'})) == 2
+    results.close()
+
+    assert cli.main(['--instances', 'QPLIB_0067', '--method', 'CRASH', '--jobs', '1', '--results', path]) == 1
+
+    # the QP of QPLIB_0018 is left out by HiGHS, not run as a failed job
+    assert cli.main(['--instances', 'QPLIB_0018', '--jobs', '1', '--backend', 'highs', '--results', path]) == 0
+    assert 'QPLIB_0018 QP unsupported by highs' in capsys.readouterr().out
+    results = store.open_results(path)
+    assert len(store.read_results(results, 'QP', {'backend': 'highs'})) == 0
+    results.close()
+
+
+def test_results_store_resumes_a_sweep(tmp_path):
+
+    path = str(tmp_path / 'results.sqlite')
+    params = {'backend': 'highs'}
+    solved = dict(_failed_result('QPLIB_0067'), status=2, solobj=-110942.0)
+
+    results = store.open_results(path)
+    store.add_result(results, ('QPLIB_0067', 'G'), params, solved)
+    store.add_result(results, ('QPLIB_0633', 'G'), params, _failed_result('QPLIB_0633'))
+    store.add_result(results, ('QPLIB_0067', 'GW'), {'backend': 'gurobi'}, solved)
+    results.close()
+
+    # a new run skips the solved job only, for the same params
+    results = store.open_results(path)
+    assert store.results_done(results, params) == {('QPLIB_0067', 'G')}
+
+    data = store.read_results(results, 'G', params)
+    assert list(data.columns) == ['name', 'timeload', 'timerun', 'gapmip', 'solobj', 'solBound', 'status', 'solrelax']
+    assert list(data['name']) == ['QPLIB_0067', 'QPLIB_0633']
+    assert data['solobj'][0] == -110942.0 and np.isnan(data['solobj'][1])
+
+    # solving it again replaces the failed row
+    store.add_result(results, ('QPLIB_0633', 'G'), params, dict(solved, name='QPLIB_0633'))
+    assert len(store.read_results(results, 'G', params)) == 2
+    assert store.results_done(results, params) == {('QPLIB_0067', 'G'), ('QPLIB_0633', 'G')}
+
+
+def test_telemetry_of_a_job():
+
+    result = runner.run_job('QPLIB_0633', 'GW', backend='highs', timelimit=1)
+
+    for key in ('timeparse', 'timepresolve', 'timebuild'):
+        assert 0.0 <= result[key] <= result['timeload'] + result['timeparse']
+    assert result['numvars'] > 150 and result['numrows'] > 0 and result['numnz'] > 0
+    assert result['trajectory'][-1] == (result['timerun'], result['solobj'], result['solBound'])
+
+
+def test_trajectory_of_a_gurobi_solve():
+
+    pytest.importorskip('gurobipy')
+    problem = small_QBL('minimize', seed=1, n=14)
+
+    result = formulations.solve_Glover_gurobi(*problem, lpfile=None)
+
+    time, incumbent, bound = np.array(result['trajectory']).T
+    assert np.all(np.diff(time) >= 0)
+    assert incumbent[-1] == pytest.approx(result['solobj']) and bound[-1] == pytest.approx(result['solBound'])
+    assert np.all(np.nan_to_num(incumbent, nan=np.inf) >= bound - 1e-6)
+
+
+def test_results_store_keeps_the_telemetry(tmp_path):
+
+    path = str(tmp_path / 'results.sqlite')
+    params = {'backend': 'highs'}
+
+    # a store written before the telemetry
+    import sqlite3
+    con = sqlite3.connect(path)
+    con.execute('CREATE TABLE results (name TEXT, method TEXT, params TEXT, '
+                + ', '.join(key + ' REAL' for key in store._result_columns[1:])
+                + ', PRIMARY KEY (name, method, params))')
+    con.close()
+
+    results = store.open_results(path)
+    solved = dict(_failed_result('QPLIB_0067'), status=2, solobj=-110942.0, timebuild=0.5, numvars=10,
+                  trajectory=[(0.1, np.nan, -120000.0), (0.2, -110000.0, -115000.0), (0.3, -110942.0, -110942.0)])
+    store.add_result(results, ('QPLIB_0067', 'G'), params, solved)
+    store.add_result(results, ('QPLIB_0067', 'G'), params, solved)
+
+    telemetry = store.read_telemetry(results, 'G', params)
+    assert telemetry['timebuild'][0] == 0.5 and telemetry['numvars'][0] == 10 and np.isnan(telemetry['timeparse'][0])
+
+    trajectory = store.read_trajectories(results, 'G', params)
+    assert list(trajectory['time']) == [0.1, 0.2, 0.3]
+    assert np.isnan(trajectory['incumbent'][0]) and trajectory['bound'][2] == -110942.0
+
+
+def test_select_instances_filters_instancedata():
+
+    datos = benchmarks.select_instances(nbinvars=(50, 130), ncons=(1, 10**6))
+
+    assert len(datos) > 0 and set(datos['probtype']) == {'QBL'}
+    assert datos['nbinvars'].between(50, 130).all() and (datos['ncons'] >= 1).all()
+    assert datos['nbinvars'].is_monotonic_increasing
+    assert all(os.path.exists(os.path.join(HERE, 'qplib', name + '.qplib')) for name in datos['name'])
+
+
+def test_performance_profile_and_shifted_geometric_mean():
+
+    # the problem 'c' was not given to B, and is left out
+    times = pd.DataFrame({'A': [1.0, 2.0, np.inf, 3.0], 'B': [2.0, 2.0, 4.0, np.nan]}, index=['a', 'b', 'd', 'c'])
+
+    profile = benchmarks.performance_profile(times)
+
+    assert list(profile.index) == [1.0, 2.0]
+    assert list(profile['A']) == pytest.approx([2/3, 2/3])
+    assert list(profile['B']) == pytest.approx([2/3, 1.0])
+    assert benchmarks.shifted_geometric_mean([6.0, 22.0]) == pytest.approx(np.sqrt(16*32) - 10)
+
+
+def test_benchmark_times_check_solobjvalue(tmp_path):
+
+    datos = pd.read_csv(os.path.join(HERE, 'instancedata.csv'))
+    datos = datos[datos['name'].isin(['QPLIB_0067', 'QPLIB_0633'])]
+    value = dict(zip(datos['name'], datos['solobjvalue']))
+    runs = benchmarks.benchmark_runs(methods=('G', 'GW'), backends=('highs',), seeds=(0, 1), timelimit=60)
+    results = store.open_results(str(tmp_path / 'results.sqlite'))
+
+    def solved(name, seconds, solobj, status=2):
+        return dict(_failed_result(name), timeload=1.0, timerun=seconds, solobj=solobj, status=status)
+
+    for method, params in runs:
+        store.add_result(results, ('QPLIB_0067', method), params, solved('QPLIB_0067', 4.0 + params['seed'], value['QPLIB_0067']))
+    G0, G1, GW0, GW1 = [params for method, params in runs]
+    store.add_result(results, ('QPLIB_0633', 'G'), G0, solved('QPLIB_0633', 60.0, 81.0, status=9))
+    store.add_result(results, ('QPLIB_0633', 'GW'), GW0, solved('QPLIB_0633', 9.0, value['QPLIB_0633'] + 1.0))
+
+    times = benchmarks.benchmark_times(results, datos, runs)
+
+    assert list(times.columns) == ['G/highs/1t', 'GW/highs/1t']
+    assert times.loc[('QPLIB_0067', 1), 'G/highs/1t'] == 6.0
+    assert np.isinf(times.loc[('QPLIB_0633', 0), 'G/highs/1t'])
+    # optimal away from the value of instancedata.csv is not solved
+    assert np.isinf(times.loc[('QPLIB_0633', 0), 'GW/highs/1t'])
+
+    table = benchmarks.benchmark_table(times, runs)
+    assert list(table['problems']) == [3, 3] and list(table['solved']) == [2, 2]
+    assert table['sgmtime'][0] == pytest.approx(np.exp(np.mean(np.log([15.0, 16.0, 70.0]))) - 10)
+
+
+def test_run_benchmark_skips_the_jobs_in_the_store(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(runner, 'methods', dict(runner.methods, G=solved))
+    runs = benchmarks.benchmark_runs(methods=('G',), backends=('highs',), threads=(2,), seeds=(0, 1), timelimit=60)
+    results = store.open_results(str(tmp_path / 'results.sqlite'))
+
+    first = list(benchmarks.run_benchmark(['QPLIB_0633', 'QPLIB_0018'], runs, workers=1, results=results))
+
+    # QPLIB_0018 cannot be linearized
+    assert sorted((job, params['seed']) for job, params, result in first) == [(('QPLIB_0633', 'G'), 0), (('QPLIB_0633', 'G'), 1)]
+    assert all(result['threads'] == 2 for job, params, result in first)
+    assert list(benchmarks.run_benchmark(['QPLIB_0633', 'QPLIB_0018'], runs, workers=1, results=results)) == []
+
+
+def test_predict_times_from_past_results():
+
+    datos = pd.read_csv(os.path.join(HERE, 'instancedata.csv'))
+    datos = datos[datos['nbinvars'] > 0]
+    history = pd.DataFrame({'name': datos['name'], 'time': 1e-4*datos['nbinvars']**1.5*(1 + datos['ncons'])**0.3})
+
+    predicted = scheduling.predict_times(datos, history.iloc[:100])
+
+    # the instances left out of the history
+    assert np.corrcoef(np.log(predicted.iloc[100:]), np.log(history['time'].iloc[100:]))[0, 1] > 0.99
+    assert scheduling.predict_times(datos, history.iloc[:3]).equals(scheduling.predict_times(datos))
+
+
+NEEDS = {'QPLIB_0067': 7.0, 'QPLIB_0633': 1.0}
+
+
+def anytime(name,typee,sense,n,m,Q0,b0,q0,A0,ccl,ccu,**options):
+
+    # solved once given NEEDS seconds in all, the time spent so far carried
+    # in the solution it starts from
+    before = 0.0 if options['start'] is None else options['start'][0]
+    spent = before + options['timelimit']
+    status = 2 if spent >= NEEDS[name[0]] else 9
+    timerun = NEEDS[name[0]] - before if status == 2 else options['timelimit']
+    return dict(_failed_result(name[0]), status=status, solobj=-spent, solBound=-NEEDS[name[0]],
+                timeload=0.0, timerun=timerun, x=np.full(n, spent), limit=options['timelimit'])
+
+
+def campaign_datos(**nobjquadnz):
+
+    datos = pd.read_csv(os.path.join(HERE, 'instancedata.csv'))
+    datos = datos[datos['name'].isin(list(NEEDS))].copy()
+    datos['nobjquadnz'] = datos['name'].map(nobjquadnz)
+    return datos
+
+
+def test_run_campaign_gives_the_hard_jobs_the_budget(monkeypatch):
+
+    monkeypatch.setattr(runner, 'methods', {'A': anytime})
+    datos = campaign_datos(QPLIB_0067=10000, QPLIB_0633=100)
+
+    results = list(scheduling.run_campaign([('QPLIB_0633', 'A'), ('QPLIB_0067', 'A')], 10, workers=1, datos=datos, minlimit=0.5, retry=False))
+
+    # longest first, with more than the 5 s of an even split
+    assert [job[0] for job, result in results] == ['QPLIB_0067', 'QPLIB_0633']
+    assert results[0][1]['limit'] > 7.0
+    assert all(result['status'] == 2 for job, result in results)
+
+
+def test_run_campaign_runs_the_stopped_jobs_again(monkeypatch):
+
+    monkeypatch.setattr(runner, 'methods', {'A': anytime})
+    # a wrong prediction: QPLIB_0633 looks the hard one; both start at
+    # once with 6 s, too little for QPLIB_0067
+    datos = campaign_datos(QPLIB_0067=100, QPLIB_0633=10000)
+
+    results = dict(scheduling.run_campaign([('QPLIB_0633', 'A'), ('QPLIB_0067', 'A')], 6, workers=2, datos=datos, minlimit=0.5))
+
+    assert results[('QPLIB_0633', 'A')]['status'] == 2
+    # solved from where it stopped with the time QPLIB_0633 left
+    result = results[('QPLIB_0067', 'A')]
+    assert result['status'] == 2 and result['timerun'] == pytest.approx(7.0)
+    assert result['solobj'] < -7.0 and result['gapmip'] < 1